@@ -14,17 +14,45 @@ Run ``python cli.py <command> --help`` for per-command options.
 """
 
 import argparse
-import json
+import asyncio
+import hashlib
+import os
+import random
 import re
 import sys
 import time
+from collections import Counter
+from functools import lru_cache
 from pathlib import Path
-
-from playwright.sync_api import sync_playwright
-
-from config import HEADLESS, LINKS_FILE, LOGIN_TIMEOUT, OUTPUT_DIR, SESSION_FILE
-from extractor import extract_links_from_modules_page, extract_links_from_page
-from login import load_session, save_session, wait_for_canvas_login
+from typing import Optional
+
+from playwright.async_api import async_playwright
+
+try:
+    import zstandard
+except ImportError:
+    zstandard = None  # zstandard is optional; only needed for --compress
+
+from config import (
+    CONCURRENCY,
+    DAEMON_FILE,
+    DAEMON_PORT,
+    HEADLESS,
+    LINKS_FILE,
+    LOGIN_TIMEOUT,
+    NO_PROMPT,
+    OUTPUT_DIR,
+    SESSION_FILE,
+)
+from extractor import (
+    DEFAULT_EXCLUDED_TYPES,
+    MODULE_ITEM_TYPES,
+    block_page_resources,
+    extract_links_from_modules_page,
+    extract_links_from_page,
+)
+from jsonio import dumps, loads, read_json, write_json
+from login import is_login_url, load_session, save_session, wait_for_canvas_login
 from transcript_kaltura import (
     debug_kaltura_video,
     process_kaltura_link,
@@ -36,31 +64,124 @@ from transcript_kaltura import (
 # Browser helpers
 # ---------------------------------------------------------------------------
 
-def _launch_browser(headless: bool = False):
-    playwright = sync_playwright().start()
-    browser = playwright.chromium.launch(headless=headless)
-    context = browser.new_context()
+_UA_PLATFORMS = {
+    "darwin": "Macintosh; Intel Mac OS X 10_15_7",
+    "win32":  "Windows NT 10.0; Win64; x64",
+}
+
+
+def _desktop_user_agent(browser_version: str) -> str:
+    """Return a regular desktop Chrome UA string for *browser_version*.
+
+    Headless Chromium advertises itself as ``HeadlessChrome``, which some
+    SSO and video providers treat as a bot.
+    """
+    platform = _UA_PLATFORMS.get(sys.platform, "X11; Linux x86_64")
+    return (f"Mozilla/5.0 ({platform}) AppleWebKit/537.36 (KHTML, like Gecko) "
+            f"Chrome/{browser_version} Safari/537.36")
+
+
+def _context_options(browser, headless: bool) -> dict:
+    """Return ``new_context`` options; headless runs pass as desktop Chrome."""
+    if not headless:
+        return {}
+    return {
+        "user_agent": _desktop_user_agent(browser.version),
+        "viewport": {"width": 1366, "height": 768},
+    }
+
+
+async def _open_browser(playwright, headless: bool, storage_state: Optional[dict]):
+    """Return *(browser, context)*, attaching to the daemon when one is running.
+
+    The daemon is only used when it runs in the requested headless mode, so
+    a login that needs a window never lands in a headless daemon.
+    """
+    browser = None
+    if DAEMON_FILE.exists():
+        endpoint, _, mode = DAEMON_FILE.read_text().strip().partition("\n")
+        wanted = "headless" if headless else "headful"
+        if mode.strip() != wanted:
+            print(f"Browser daemon at {endpoint} is not {wanted} — launching a new browser")
+        else:
+            try:
+                browser = await playwright.chromium.connect_over_cdp(endpoint)
+                print(f"Using browser daemon at {endpoint}")
+            except Exception:
+                print(f"Browser daemon at {endpoint} not reachable — launching a new browser")
+    if browser is None:
+        browser = await playwright.chromium.launch(headless=headless)
+
+    context = await browser.new_context(
+        storage_state=storage_state, **_context_options(browser, headless)
+    )
+    return browser, context
+
+
+async def _launch_browser(headless: bool = False, storage_state: Optional[dict] = None):
+    """Start Playwright and return *(playwright, browser, context)*.
+
+    Attaches to a running ``cli.py daemon`` browser when one is advertised in
+    DAEMON_FILE, skipping Chromium start-up; otherwise launches a new one.
+    """
+    playwright = await async_playwright().start()
+    browser, context = await _open_browser(playwright, headless, storage_state)
     return playwright, browser, context
 
 
-def _authenticate(context, page, session_file: Path, login_timeout: int) -> bool:
-    """Load saved session or wait for the user to complete SSO/MFA.
+def _resolve_headless(headless: Optional[bool], state: Optional[dict]) -> bool:
+    """Resolve the "auto" setting: headless only when a session is available."""
+    return state is not None if headless is None else headless
+
+
+async def _reopen_for_login(playwright, browser, url: str):
+    """Replace a headless browser with a visible one so the user can log in.
+
+    Returns *(browser, context, page)* with *page* already at *url*.
+    """
+    print("Login required — reopening the browser with a window")
+    await browser.close()
+    browser, context = await _open_browser(playwright, False, None)
+    page = await context.new_page()
+    await page.goto(url, wait_until="domcontentloaded")
+    return browser, context, page
+
+
+def _load_saved_session(session_file: Path) -> Optional[dict]:
+    state = load_session(session_file)
+    if state is not None:
+        print(f"Loaded session from {session_file}")
+    return state
+
+
+async def _close_browser(playwright, browser, prompt: bool = True) -> None:
+    # Nobody can answer the prompt in scripted or scheduled runs
+    if prompt and not NO_PROMPT and sys.stdin.isatty():
+        try:
+            input("\nPress Enter to close the browser...")
+        except (EOFError, KeyboardInterrupt):
+            pass
+    await browser.close()
+    await playwright.stop()
 
+
+async def _authenticate(
+    context, page, session_file: Path, login_timeout: int, had_session: bool
+) -> bool:
+    """Wait for the user to complete SSO/MFA, then save the new session.
+
+    *had_session* says whether a saved session was loaded for this run.
     Returns True when the browser is authenticated, False on failure.
     """
-    if session_file.exists():
-        ok = load_session(context, session_file)
-        if ok:
-            print(f"Loaded session from {session_file}")
-            return True
+    if had_session:
         print("Saved session is expired or invalid — please log in again.")
 
     print("\n--- Login required ---")
     print("Please log in to Canvas in the browser window.")
-    ok = wait_for_canvas_login(page, timeout=login_timeout)
+    ok = await wait_for_canvas_login(page, timeout=login_timeout)
     if not ok:
         return False
-    save_session(context, session_file)
+    await save_session(context, session_file)
     return True
 
 
@@ -68,94 +189,178 @@ def _authenticate(context, page, session_file: Path, login_timeout: int) -> bool
 # Subcommand: extract-page / crawl-course
 # ---------------------------------------------------------------------------
 
-def cmd_extract_links(
-    url: str,
+async def cmd_extract_links(
+    urls: list[str],
     output: Path,
     session_file: Path,
-    headless: bool,
+    headless: Optional[bool],
     login_timeout: int,
+    concurrency: int,
+    block_resources: bool,
+    include_types: Optional[frozenset] = None,
+    exclude_types: frozenset = DEFAULT_EXCLUDED_TYPES,
 ) -> None:
-    """Extract video links from a Canvas page or course and save to JSON."""
-    playwright, browser, context = _launch_browser(headless=headless)
-    try:
-        page = context.new_page()
-        page.goto(url)
-        page.wait_for_load_state("domcontentloaded")
+    """Extract video links from Canvas pages or courses and save to JSON.
 
-        needs_login = any(
-            k in page.url.lower() for k in ("login", "sso", "saml")
-        )
-        if needs_login:
-            ok = _authenticate(context, page, session_file, login_timeout)
+    Several *urls* share one browser and session; after the first one has
+    been loaded (and login handled), the rest are scraped concurrently.
+    """
+    state = _load_saved_session(session_file)
+    auto_headless = headless is None
+    headless = _resolve_headless(headless, state)
+    playwright, browser, context = await _launch_browser(headless=headless, storage_state=state)
+    try:
+        page = await context.new_page()
+        await page.goto(urls[0], wait_until="domcontentloaded")
+
+        if is_login_url(page.url):
+            if auto_headless and headless:
+                browser, context, page = await _reopen_for_login(playwright, browser, urls[0])
+                headless = False
+            ok = await _authenticate(
+                context, page, session_file, login_timeout, had_session=state is not None
+            )
             if not ok:
                 print("Authentication failed.")
                 sys.exit(1)
-            page.goto(url)
-            page.wait_for_load_state("domcontentloaded")
-        elif session_file.exists():
-            load_session(context, session_file)
-
-        print(f"\nPage:  {page.title()}")
-        print(f"URL:   {page.url}")
-
-        # Auto-detect modules page vs single page
-        if "/modules" in page.url and "/modules/items" not in page.url:
-            print("\n--- Modules page detected — crawling all module items ---")
-            links = extract_links_from_modules_page(page, context)
-        else:
-            print("\n--- Extracting links from page ---")
-            links = extract_links_from_page(page)
+            await page.goto(urls[0], wait_until="domcontentloaded")
+
+        # Module crawls split the page budget so the total stays near
+        # *concurrency* however many URLs run at once
+        crawl_concurrency = max(concurrency // min(concurrency, len(urls)), 1)
+
+        async def _scrape(page) -> tuple[str, dict]:
+            title, page_url = await page.title(), page.url
+            print(f"\nPage:  {title}")
+            print(f"URL:   {page_url}")
+
+            # Auto-detect modules page vs single page
+            if "/modules" in page_url and "/modules/items" not in page_url:
+                print("\n--- Modules page detected — crawling all module items ---")
+                extracted = await extract_links_from_modules_page(
+                    page, context, crawl_concurrency,
+                    block_resources=block_resources,
+                    include_types=include_types,
+                    exclude_types=exclude_types,
+                )
+            else:
+                print("\n--- Extracting links from page ---")
+                extracted = await extract_links_from_page(page)
+            return title, extracted
+
+        limit = asyncio.Semaphore(concurrency)
+
+        async def _scrape_url(url: str) -> tuple[str, dict]:
+            async with limit:
+                url_page = await context.new_page()
+                if block_resources:
+                    await block_page_resources(url_page)
+                try:
+                    await url_page.goto(url, wait_until="domcontentloaded")
+                    return await _scrape(url_page)
+                finally:
+                    await url_page.close()
+
+        async def _scrape_safe(url: str, scrape) -> tuple[Optional[str], Optional[dict], Optional[Exception]]:
+            # One failing URL is reported and skipped rather than losing the rest
+            try:
+                title, extracted = await scrape
+                return title, extracted, None
+            except Exception as e:
+                print(f"\nError — {url}: {e}")
+                return None, None, e
+
+        scraped = await asyncio.gather(
+            _scrape_safe(urls[0], _scrape(page)),
+            *(_scrape_safe(url, _scrape_url(url)) for url in urls[1:]),
+        )
+        succeeded = [s for s in scraped if s[2] is None]
+        if not succeeded:
+            print("\nNo pages could be scraped.")
+            sys.exit(1)
+
+        # Merge in argument order; the first page to link a video owns it.
+        # Providers are tallied in the same pass for the summary counts.
+        merged: dict[str, dict] = {}
+        providers: Counter = Counter()
+        for _, extracted, _ in succeeded:
+            for link in extracted["links"]:
+                if link["href"] not in merged:
+                    merged[link["href"]] = link
+                    providers[link.get("video_provider")] += 1
+        links = list(merged.values())
+        title = succeeded[0][0]
 
         output.parent.mkdir(parents=True, exist_ok=True)
         result = {
-            "page_url": url,
-            "page_title": page.title(),
+            "page_url": urls[0],
+            "page_title": title,
             "links": links,
             "total_links": len(links),
-            "video_links_count": sum(1 for l in links if l.get("video_provider")),
+            "video_links_count": len(links) - providers[None],
         }
-        with open(output, "w") as f:
-            json.dump(result, f, indent=2)
-
+        if len(urls) > 1:
+            result["pages"] = [
+                {"page_url": url, "error": str(error)} if error is not None else {
+                    "page_url": url,
+                    "page_title": page_title,
+                    "total_links": len(extracted["links"]),
+                    "video_links_count": extracted["video_count"],
+                }
+                for url, (page_title, extracted, error) in zip(urls, scraped)
+            ]
+        write_json(output, result)
+
+        if len(urls) > 1:
+            failed = len(urls) - len(succeeded)
+            print(f"\nPages:         {len(succeeded)}" + (f" ({failed} failed)" if failed else ""))
         print(f"\nTotal links:   {result['total_links']}")
         print(f"Video links:   {result['video_links_count']}")
         print(f"Saved to:      {output}")
 
-        kaltura_n = sum(1 for l in links if l.get("video_provider") == "kaltura")
+        kaltura_n = providers["kaltura"]
         if kaltura_n:
             print(f"\n{kaltura_n} Kaltura video(s) found.")
             print("Run:  python cli.py extract-video")
 
     finally:
-        try:
-            input("\nPress Enter to close the browser...")
-        except (EOFError, KeyboardInterrupt):
-            pass
-        browser.close()
-        playwright.stop()
+        await _close_browser(playwright, browser, prompt=not headless)
 
 
 # ---------------------------------------------------------------------------
 # Subcommand: extract-video
 # ---------------------------------------------------------------------------
 
-def cmd_extract_video(
+async def cmd_extract_video(
     links_file: Path,
     output_dir: Path,
     session_file: Path,
-    headless: bool,
+    headless: Optional[bool],
     login_timeout: int,
     debug: bool,
     retry_failed: bool,
+    concurrency: int,
+    isolate_videos: bool = False,
+    pretty: bool = False,
+    compress: bool = False,
 ) -> None:
-    """Extract transcripts for all Kaltura videos in *links_file*."""
+    """Extract transcripts for all Kaltura videos in *links_file*.
+
+    With *isolate_videos* every video loads in a fresh browser context, so no
+    cookies, cache or player state carry over from the previous video.
+    metadata.json is written compact unless *pretty* is set.  With *compress*
+    transcripts are saved zstd-compressed as ``.txt.zst``.
+    """
+    if compress and zstandard is None:
+        print("Error: --compress needs the zstandard package (pip install zstandard).")
+        sys.exit(1)
+
     if not links_file.exists():
         print(f"Error: {links_file} not found.")
         print("Run 'python cli.py extract-page <url>' or 'python cli.py crawl-course <url>' first.")
         sys.exit(1)
 
-    with open(links_file) as f:
-        links_data = json.load(f)
+    links_data = read_json(links_file)
 
     kaltura_links = [
         l for l in links_data.get("links", [])
@@ -166,10 +371,10 @@ def cmd_extract_video(
         sys.exit(0)
 
     metadata_file = output_dir / "metadata.json"
+    journal_file = output_dir / "metadata.jsonl"
 
     if retry_failed and metadata_file.exists():
-        with open(metadata_file) as f:
-            prev = json.load(f)
+        prev = read_json(metadata_file)
         failed_urls = {
             v["source_url"] for v in prev.get("videos", [])
             if not v.get("transcript_found")
@@ -184,123 +389,289 @@ def cmd_extract_video(
     # Base Canvas URL for login fallback
     canvas_url = links_data.get("page_url", "")
 
-    playwright, browser, context = _launch_browser(headless=headless)
+    state = _load_saved_session(session_file)
+    auto_headless = headless is None
+    headless = _resolve_headless(headless, state)
+    playwright, browser, context = await _launch_browser(headless=headless, storage_state=state)
     try:
-        # Authenticate
-        if session_file.exists():
-            ok = load_session(context, session_file)
-            if ok:
-                print(f"Loaded session from {session_file}")
-            else:
-                print("Saved session expired.")
-                ok = False
-        else:
-            ok = False
-
-        if not ok and canvas_url:
-            login_page = context.new_page()
-            print(f"Opening Canvas for login: {canvas_url}")
-            login_page.goto(canvas_url)
-            ok = wait_for_canvas_login(login_page, timeout=login_timeout)
-            if not ok:
-                print("Login timed out.")
-                sys.exit(1)
-            save_session(context, session_file)
-            login_page.close()
+        # Authenticate — a saved session is probed first, since it may have
+        # expired and redirect to the SSO login page
+        if canvas_url:
+            login_page = await context.new_page()
+            print(f"Opening Canvas: {canvas_url}")
+            await login_page.goto(canvas_url, wait_until="domcontentloaded")
+            if state is None or is_login_url(login_page.url):
+                if auto_headless and headless:
+                    browser, context, login_page = await _reopen_for_login(
+                        playwright, browser, canvas_url
+                    )
+                    headless = False
+                ok = await _authenticate(
+                    context, login_page, session_file, login_timeout, had_session=state is not None
+                )
+                if not ok:
+                    print("Authentication failed.")
+                    sys.exit(1)
+            await login_page.close()
 
         # Debug mode: deep-inspect first video only
         if debug:
             print("\n=== DEBUG MODE — analysing first video only ===")
-            page = context.new_page()
-            debug_result = debug_kaltura_video(page, kaltura_links[0], context, browser)
+            page = await context.new_page()
+            debug_result = await debug_kaltura_video(page, kaltura_links[0])
             debug_file = output_dir / "kaltura_debug.json"
-            with open(debug_file, "w") as f:
-                json.dump(debug_result, f, indent=2)
+            write_json(debug_file, debug_result)
             print(f"\nDebug info saved to: {debug_file}")
             _print_debug_summary(debug_result)
             return
 
-        # Normal extraction
-        results: list[dict] = []
-        page = context.new_page()
-
-        for i, link in enumerate(kaltura_links, 1):
-            print(f"\n[{i}/{len(kaltura_links)}]")
-            result = process_kaltura_link(page, link, context, browser)
-            results.append(result)
-
-            if result["transcript_found"] and result.get("transcript_text"):
-                # Place transcript in a module subdirectory when available
-                module_name = link.get("module_name", "")
-                subdir = output_dir / _safe_dir_name(module_name) if module_name else output_dir
-                subdir.mkdir(parents=True, exist_ok=True)
-
-                safe_name = sanitize_filename(result["title"])
-                transcript_file = subdir / f"{safe_name}.txt"
-                counter = 1
-                while transcript_file.exists():
-                    transcript_file = subdir / f"{safe_name}_{counter}.txt"
-                    counter += 1
-
-                with open(transcript_file, "w", encoding="utf-8") as f:
-                    f.write(result["transcript_text"])
-
-                result["transcript_path"] = str(transcript_file.relative_to(output_dir))
-                result["transcript_preview"] = result["transcript_text"][:200]
-                print(f"    ✓ Saved: {result['transcript_path']}")
-            else:
-                result["transcript_path"] = None
-                result["transcript_preview"] = None
+        # Resume an interrupted run: videos already in the journal are
+        # skipped.  A --retry-failed run only keeps the journal's successes,
+        # so failures recorded there are retried rather than merged back.
+        done = _load_journal(journal_file)
+        if retry_failed:
+            done = {url: r for url, r in done.items() if r["transcript_found"]}
+        if done:
+            kaltura_links = [l for l in kaltura_links if l["href"] not in done]
+            print(f"Resuming previous run — {len(done)} video(s) already processed, "
+                  f"{len(kaltura_links)} remaining")
+
+        # Normal extraction — each worker gets its own context seeded with
+        # the authenticated storage state, so videos load in parallel.  When
+        # videos are isolated the pool only holds concurrency slots (None)
+        # and each video creates and closes its own context.
+        state = await context.storage_state()
+        options = _context_options(browser, headless)
+        pool: asyncio.Queue = asyncio.Queue()
+        workers = []
+        for _ in range(max(min(concurrency, len(kaltura_links)), 1)):
+            if isolate_videos:
+                pool.put_nowait(None)
+                continue
+            worker_context = await browser.new_context(storage_state=state, **options)
+            workers.append(worker_context)
+            pool.put_nowait((worker_context, await worker_context.new_page()))
+
+        # Transcript subdirectories already created this run
+        made_dirs: set[Path] = set()
+        extension = ".txt.zst" if compress else ".txt"
+        # Running total of transcripts found, including resumed videos
+        found = sum(1 for v in done.values() if v["transcript_found"])
+        # With several videos in flight each one's log is buffered and
+        # printed as a block when it finishes, so lines never interleave
+        buffered = min(concurrency, len(kaltura_links)) > 1
+
+        async def _process(i: int, link: dict) -> dict:
+            nonlocal found
+            slot = await pool.get()
+            started = time.monotonic()
+            worker_context = None
+            lines: list[str] = []
+            log = lines.append if buffered else print
+            try:
+                if slot is None:
+                    worker_context = await browser.new_context(storage_state=state, **options)
+                    page = await worker_context.new_page()
+                else:
+                    worker_context, page = slot
+                log(f"\n[{i}/{len(kaltura_links)}]")
+                result = await process_kaltura_link(page, link, log)
+
+                if result["transcript_found"]:
+                    found += 1
+                if result["transcript_found"] and result.get("transcript_text"):
+                    # Place transcript in a module subdirectory when available
+                    module_name = link.get("module_name", "")
+                    subdir = output_dir / _safe_dir_name(module_name) if module_name else output_dir
+                    if subdir not in made_dirs:
+                        subdir.mkdir(parents=True, exist_ok=True)
+                        made_dirs.add(subdir)
+
+                    # A stable per-video hash keeps same-title videos apart and
+                    # lets re-runs overwrite the same file rather than pile up copies
+                    safe_name = sanitize_filename(result["title"])
+                    transcript_file = subdir / f"{safe_name}_{_url_suffix(link['href'])}{extension}"
+
+                    # Encoding, compression and the disk write run on a worker
+                    # thread so other videos keep loading meanwhile
+                    await asyncio.to_thread(
+                        _write_transcript, transcript_file, result["transcript_text"], compress
+                    )
+
+                    result["transcript_path"] = str(transcript_file.relative_to(output_dir))
+                    result["transcript_preview"] = result["transcript_text"][:200]
+                    log(f"    ✓ Saved: {result['transcript_path']}")
+                else:
+                    result["transcript_path"] = None
+                    result["transcript_preview"] = None
+
+                # Drop the heavy/sensitive fields now so the result doubles
+                # as its own metadata record
+                for key in _METADATA_OMIT:
+                    result.pop(key, None)
+                _append_journal(journal, result)
+
+                # Polite jittered spacing between this worker's videos; time
+                # already spent on the video counts towards it
+                pause = random.uniform(0.5, 1.5) - (time.monotonic() - started)
+                if pause > 0:
+                    await asyncio.sleep(pause)
+                return result
+            finally:
+                if lines:
+                    print("\n".join(lines))
+                if slot is None and worker_context is not None:
+                    await worker_context.close()
+                pool.put_nowait(slot)
 
-            if i < len(kaltura_links):
-                time.sleep(1)
-
-        page.close()
+        try:
+            with open(journal_file, "ab") as journal:
+                results = await asyncio.gather(
+                    *(_process(i, link) for i, link in enumerate(kaltura_links, 1))
+                )
+        finally:
+            await asyncio.gather(*(c.close() for c in workers))
+
+        lines: list[str] = []
+        for r in results:
+            status = "✓" if r["transcript_found"] else "✗"
+            lines.append(f"  {status} {r['title'][:60]}")
+            lines.extend(f"      ! {e}" for e in r["errors"])
 
-        # Write metadata — omit transcript_text (large) and
-        # transcript_candidate_selector (may contain signed serve URLs with auth tokens)
-        _METADATA_OMIT = {"transcript_text", "transcript_candidate_selector"}
-        meta_videos = [
-            {k: v for k, v in r.items() if k not in _METADATA_OMIT}
-            for r in results
-        ]
+        meta_videos = list(done.values()) + results
         metadata = {
-            "total_videos": len(results),
-            "transcripts_found": sum(1 for r in results if r["transcript_found"]),
+            "total_videos": len(meta_videos),
+            "transcripts_found": found,
             "videos": meta_videos,
         }
-        with open(metadata_file, "w", encoding="utf-8") as f:
-            json.dump(metadata, f, indent=2)
-
-        # Summary
-        print(f"\n{'=' * 50}")
-        print(f"Videos processed:   {metadata['total_videos']}")
-        print(f"Transcripts found:  {metadata['transcripts_found']}")
-        print(f"Output directory:   {output_dir}")
-        print(f"Metadata:           {metadata_file}")
-        for r in results:
-            status = "✓" if r["transcript_found"] else "✗"
-            print(f"  {status} {r['title'][:60]}")
-            for e in r.get("errors", []):
-                print(f"      ! {e}")
+        write_json(metadata_file, metadata, indent=pretty)
+        journal_file.unlink()
+
+        # Summary, written in one call
+        print("\n".join([
+            f"\n{'=' * 50}",
+            f"Videos processed:   {metadata['total_videos']}",
+            f"Transcripts found:  {found}",
+            f"Output directory:   {output_dir}",
+            f"Metadata:           {metadata_file}",
+            *lines,
+        ]))
 
     finally:
+        await _close_browser(playwright, browser, prompt=not headless)
+
+
+# ---------------------------------------------------------------------------
+# Subcommand: daemon
+# ---------------------------------------------------------------------------
+
+async def cmd_daemon(headless: bool, port: int, endpoint_file: Path) -> None:
+    """Keep one Chromium running so later commands can attach to it."""
+    async with async_playwright() as playwright:
+        browser = await playwright.chromium.launch(
+            headless=headless, args=[f"--remote-debugging-port={port}"]
+        )
+        endpoint = f"http://127.0.0.1:{port}"
+        mode = "headless" if headless else "headful"
+        endpoint_file.parent.mkdir(parents=True, exist_ok=True)
+        # Second line records the mode; commands wanting the other one skip the daemon
+        endpoint_file.write_text(f"{endpoint}\n{mode}\n")
+        print(f"Browser daemon ({mode}) listening on {endpoint}")
+        print("Other commands will reuse it. Press Ctrl+C to stop.")
+
+        closed = asyncio.Event()
+        browser.on("disconnected", lambda _: closed.set())
         try:
-            input("\nPress Enter to close the browser...")
-        except (EOFError, KeyboardInterrupt):
-            pass
-        browser.close()
-        playwright.stop()
+            await closed.wait()
+        finally:
+            endpoint_file.unlink(missing_ok=True)
+            await browser.close()
 
 
 # ---------------------------------------------------------------------------
 # Helpers
 # ---------------------------------------------------------------------------
 
+# Keys left out of metadata — transcript_text (large) and
+# transcript_candidate_selector (may contain signed serve URLs with auth tokens)
+_METADATA_OMIT = {"transcript_text", "transcript_candidate_selector"}
+
+
+def _load_journal(journal_file: Path) -> dict[str, dict]:
+    """Return metadata records from an interrupted run, keyed by source URL.
+
+    A partially written last line is dropped and the file truncated to the
+    end of the last complete record so new records append cleanly.
+    """
+    if not journal_file.exists():
+        return {}
+    data = journal_file.read_bytes()
+    end = data.rfind(b"\n") + 1
+    if end < len(data):
+        with open(journal_file, "r+b") as f:
+            f.truncate(end)
+    records = (loads(line) for line in data[:end].splitlines() if line.strip())
+    return {r["source_url"]: r for r in records}
+
+
+def _append_journal(journal, record: dict) -> None:
+    """Append *record* to the open *journal* and flush it to disk."""
+    journal.write(dumps(record) + b"\n")
+    journal.flush()
+    os.fsync(journal.fileno())
+
+
+def _write_transcript(path: Path, text: str, compress: bool) -> None:
+    """Write *text* to *path* as UTF-8 bytes, zstd-compressed if *compress*."""
+    data = text.encode("utf-8")
+    if compress:
+        # A compressor per call: instances must not be shared between threads
+        data = zstandard.ZstdCompressor(level=3).compress(data)
+    with open(path, "wb") as f:
+        f.write(data)
+
+
+def _url_suffix(url: str) -> str:
+    """Return a short, stable hex tag identifying *url*."""
+    return hashlib.blake2b(url.encode("utf-8"), digest_size=4).hexdigest()
+
+
+_DIR_NAME_SEPARATORS = str.maketrans("/:&,", "    ")
+_DIR_NAME_RUNS = re.compile(r"[\s_]+")
+
+
+@lru_cache(maxsize=512)
 def _safe_dir_name(name: str) -> str:
-    s = re.sub(r"[/:&,]", " ", name)
-    s = re.sub(r"\s+", "_", s.strip())
-    return re.sub(r"_+", "_", s).strip("_")
+    s = name.translate(_DIR_NAME_SEPARATORS).strip()
+    return _DIR_NAME_RUNS.sub("_", s).strip("_")
+
+
+def _expand_urls(args: list[str]) -> list[str]:
+    """Expand ``@FILE`` and ``-`` (stdin) URL-list arguments in place.
+
+    List files hold one URL per line; blank lines and ``#`` comments are
+    skipped.  Duplicate URLs keep their first position.
+    """
+    urls: dict[str, None] = {}
+    for arg in args:
+        if arg == "-":
+            lines = sys.stdin.read().splitlines()
+        elif arg.startswith("@"):
+            try:
+                lines = Path(arg[1:]).read_text(encoding="utf-8").splitlines()
+            except OSError as e:
+                print(f"Error: cannot read URL list {arg[1:]}: {e}")
+                sys.exit(1)
+        else:
+            lines = [arg]
+        for line in lines:
+            line = line.strip()
+            if line and not line.startswith("#"):
+                urls.setdefault(line, None)
+    if not urls:
+        print("Error: no URLs given.")
+        sys.exit(1)
+    return list(urls)
 
 
 def _print_debug_summary(d: dict) -> None:
@@ -341,14 +712,66 @@ def _shared_args(p: argparse.ArgumentParser) -> None:
         "--session-file", type=Path, default=SESSION_FILE, metavar="PATH",
         help=f"Session cookie file (default: {SESSION_FILE})",
     )
-    p.add_argument(
+    window = p.add_mutually_exclusive_group()
+    window.add_argument(
         "--headless", action="store_true", default=HEADLESS,
-        help="Run browser in headless mode (default: false)",
+        help="Always run the browser without a window "
+             "(default: only when a saved session exists)",
+    )
+    window.add_argument(
+        "--headful", dest="headless", action="store_false", default=HEADLESS,
+        help="Always show the browser window",
     )
     p.add_argument(
         "--login-timeout", type=int, default=LOGIN_TIMEOUT, metavar="SECS",
         help=f"Seconds to wait for SSO/MFA login (default: {LOGIN_TIMEOUT})",
     )
+    p.add_argument(
+        "--concurrency", type=_positive_int, default=CONCURRENCY, metavar="N",
+        help=f"Pages or videos to process in parallel (default: {CONCURRENCY})",
+    )
+
+
+def _positive_int(value: str) -> int:
+    """argparse type for a count that must be at least 1."""
+    try:
+        n = int(value)
+    except ValueError:
+        raise argparse.ArgumentTypeError(f"invalid integer: {value!r}")
+    if n < 1:
+        raise argparse.ArgumentTypeError(f"must be at least 1, got {n}")
+    return n
+
+
+def _item_types(value: str) -> frozenset:
+    """argparse type for a comma-separated list of module item types."""
+    types = frozenset(t.strip() for t in value.split(",") if t.strip())
+    unknown = types.difference(MODULE_ITEM_TYPES)
+    if unknown:
+        raise argparse.ArgumentTypeError(
+            f"unknown item type(s): {', '.join(sorted(unknown))} "
+            f"(choose from {', '.join(MODULE_ITEM_TYPES)})"
+        )
+    return types
+
+
+def _crawl_args(p: argparse.ArgumentParser) -> None:
+    p.add_argument(
+        "--no-resource-block", dest="block_resources", action="store_false",
+        help="Load images, fonts, media, stylesheets and trackers while crawling",
+    )
+    types = p.add_mutually_exclusive_group()
+    types.add_argument(
+        "--include-types", type=_item_types, metavar="TYPES",
+        help="Only visit module items of these comma-separated types "
+             f"({', '.join(MODULE_ITEM_TYPES)})",
+    )
+    types.add_argument(
+        "--exclude-types", type=_item_types, default=DEFAULT_EXCLUDED_TYPES,
+        metavar="TYPES",
+        help="Skip module items of these comma-separated types "
+             f"(default: {','.join(sorted(DEFAULT_EXCLUDED_TYPES))})",
+    )
 
 
 def build_parser() -> argparse.ArgumentParser:
@@ -361,13 +784,18 @@ commands:
   extract-page   Extract video links from a single Canvas page
   crawl-course   Crawl all module items in a Canvas course (/modules URL)
   extract-video  Download transcripts for detected Kaltura videos
+  daemon         Keep a browser running for the other commands to reuse
 
 environment variables (or .env file):
   CT_SESSION_FILE   Cookie file path        (default: session.json)
   CT_LINKS_FILE     Extracted links file    (default: links_output.json)
   CT_OUTPUT_DIR     Transcript directory    (default: transcripts)
   CT_LOGIN_TIMEOUT  SSO wait in seconds     (default: 180)
-  CT_HEADLESS       Headless browser        (default: false)
+  CT_HEADLESS       Headless browser        (default: auto)
+  CT_CONCURRENCY    Parallel pages/videos   (default: 4)
+  CT_DAEMON_FILE    Daemon endpoint file    (default: ~/.cache/canvas-transcriber/endpoint)
+  CT_DAEMON_PORT    Daemon debugging port   (default: 9222)
+  CT_NO_PROMPT      Skip "Press Enter" pause (default: false; always skipped without a terminal)
 """,
     )
 
@@ -380,11 +808,15 @@ environment variables (or .env file):
         help="Extract video links from a single Canvas page",
     )
     _shared_args(p_ep)
-    p_ep.add_argument("url", help="Canvas page URL")
+    p_ep.add_argument(
+        "urls", nargs="+", metavar="url",
+        help="Canvas page URL(s); @FILE reads one URL per line, - reads stdin",
+    )
     p_ep.add_argument(
         "--output", type=Path, default=LINKS_FILE, metavar="FILE",
         help=f"Output JSON file (default: {LINKS_FILE})",
     )
+    _crawl_args(p_ep)
 
     # crawl-course
     p_cc = subs.add_parser(
@@ -392,11 +824,15 @@ environment variables (or .env file):
         help="Crawl all module items in a Canvas course",
     )
     _shared_args(p_cc)
-    p_cc.add_argument("url", help="Canvas /modules page URL")
+    p_cc.add_argument(
+        "urls", nargs="+", metavar="url",
+        help="Canvas /modules page URL(s); @FILE reads one URL per line, - reads stdin",
+    )
     p_cc.add_argument(
         "--output", type=Path, default=LINKS_FILE, metavar="FILE",
         help=f"Output JSON file (default: {LINKS_FILE})",
     )
+    _crawl_args(p_cc)
 
     # extract-video
     p_ev = subs.add_parser(
@@ -420,6 +856,32 @@ environment variables (or .env file):
         "--retry-failed", action="store_true",
         help="Retry only videos that failed in the previous run",
     )
+    p_ev.add_argument(
+        "--isolate-videos", action="store_true",
+        help="Load every video in a fresh browser context (slower; no state shared between videos)",
+    )
+    p_ev.add_argument(
+        "--pretty", action="store_true",
+        help="Indent metadata.json for reading (default: compact)",
+    )
+    p_ev.add_argument(
+        "--compress", action="store_true",
+        help="Save transcripts zstd-compressed as .txt.zst (needs the zstandard package)",
+    )
+
+    # daemon
+    p_d = subs.add_parser(
+        "daemon",
+        help="Keep a browser running for the other commands to reuse",
+    )
+    p_d.add_argument(
+        "--headless", action="store_true", default=HEADLESS,
+        help="Run browser in headless mode (default: false)",
+    )
+    p_d.add_argument(
+        "--port", type=int, default=DAEMON_PORT, metavar="PORT",
+        help=f"Local remote-debugging port (default: {DAEMON_PORT})",
+    )
 
     return parser
 
@@ -429,15 +891,19 @@ def main() -> None:
     args = parser.parse_args()
 
     if args.command in ("extract-page", "crawl-course"):
-        cmd_extract_links(
-            url=args.url,
+        asyncio.run(cmd_extract_links(
+            urls=_expand_urls(args.urls),
             output=args.output,
             session_file=args.session_file,
             headless=args.headless,
             login_timeout=args.login_timeout,
-        )
+            concurrency=args.concurrency,
+            block_resources=args.block_resources,
+            include_types=args.include_types,
+            exclude_types=args.exclude_types,
+        ))
     elif args.command == "extract-video":
-        cmd_extract_video(
+        asyncio.run(cmd_extract_video(
             links_file=args.links_file,
             output_dir=args.output_dir,
             session_file=args.session_file,
@@ -445,7 +911,20 @@ def main() -> None:
             login_timeout=args.login_timeout,
             debug=args.debug,
             retry_failed=args.retry_failed,
-        )
+            concurrency=args.concurrency,
+            isolate_videos=args.isolate_videos,
+            pretty=args.pretty,
+            compress=args.compress,
+        ))
+    elif args.command == "daemon":
+        try:
+            asyncio.run(cmd_daemon(
+                headless=bool(args.headless),
+                port=args.port,
+                endpoint_file=DAEMON_FILE,
+            ))
+        except KeyboardInterrupt:
+            print("\nBrowser daemon stopped.")
 
 
 if __name__ == "__main__":
@@ -18,7 +18,19 @@ except ImportError:
 SESSION_FILE = Path(os.getenv("CT_SESSION_FILE", "session.json"))
 LINKS_FILE = Path(os.getenv("CT_LINKS_FILE", "links_output.json"))
 OUTPUT_DIR = Path(os.getenv("CT_OUTPUT_DIR", "transcripts"))
+DAEMON_FILE = Path(os.getenv(
+    "CT_DAEMON_FILE", Path.home() / ".cache" / "canvas-transcriber" / "endpoint"
+)).expanduser()
 
 # Behaviour
 LOGIN_TIMEOUT = int(os.getenv("CT_LOGIN_TIMEOUT", "180"))
-HEADLESS = os.getenv("CT_HEADLESS", "false").lower() in ("1", "true", "yes")
+# "auto" (None): headless when a saved session exists, a window for login
+_headless = os.getenv("CT_HEADLESS", "auto").lower()
+HEADLESS = None if _headless == "auto" else _headless in ("1", "true", "yes")
+CONCURRENCY = int(os.getenv("CT_CONCURRENCY", "4"))
+if CONCURRENCY < 1:
+    raise ValueError(f"CT_CONCURRENCY must be at least 1, got {CONCURRENCY}")
+DAEMON_PORT = int(os.getenv("CT_DAEMON_PORT", "9222"))
+# Skip the "Press Enter to close the browser" pause (it is also skipped
+# whenever stdin is not a terminal)
+NO_PROMPT = os.getenv("CT_NO_PROMPT", "").lower() in ("1", "true", "yes")
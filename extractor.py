@@ -8,7 +8,10 @@ Provides two entry points used by the CLI:
   /modules page and collect video links from the destination pages.
 """
 
+import asyncio
 import re
+import sys
+from functools import lru_cache
 from typing import Optional
 
 
@@ -27,74 +30,146 @@ _VIDEO_PROVIDERS: dict[str, list[str]] = {
 }
 
 
+# Substrings shared by every provider pattern above.  Most Canvas links are
+# not videos, and these few ``in`` tests reject them before the provider
+# loop.  A provider pattern no hint covers would never be detected, so the
+# coverage is checked at import.
+_PROVIDER_HINTS = ("panopto", "kaltura", "kaf", "yuja", "zoom", "youtu", "media", "vimeo")
+assert all(
+    any(hint in pattern for hint in _PROVIDER_HINTS)
+    for patterns in _VIDEO_PROVIDERS.values() for pattern in patterns
+), "every _VIDEO_PROVIDERS pattern needs a matching _PROVIDER_HINTS entry"
+
+
+@lru_cache(maxsize=4096)
 def detect_video_provider(href: str) -> Optional[str]:
-    """Return the detected video provider name for *href*, or ``None``."""
+    """Return the detected video provider name for *href*, or ``None``.
+
+    Providers are tried in ``_VIDEO_PROVIDERS`` order, so a URL naming two
+    providers (e.g. a YouTube embed with a Kaltura origin) resolves to the
+    one listed first.
+    """
     href_lower = href.lower()
+    if not any(hint in href_lower for hint in _PROVIDER_HINTS):
+        return None
     for provider, patterns in _VIDEO_PROVIDERS.items():
-        for pattern in patterns:
-            if pattern in href_lower:
-                return provider
+        if any(pattern in href_lower for pattern in patterns):
+            return provider
     return None
 
 
+# ---------------------------------------------------------------------------
+# Resource blocking
+# ---------------------------------------------------------------------------
+
+# Link scraping only needs the DOM; everything else is wasted bandwidth.
+_BLOCKED_RESOURCE_TYPES = frozenset({
+    "image", "media", "font", "stylesheet", "websocket", "manifest", "other",
+})
+
+
+# Analytics and tracking hosts commonly loaded by Canvas pages and themes.
+_TRACKER_RE = re.compile(
+    r"google-analytics\.com|googletagmanager\.com|doubleclick\.net|"
+    r"segment\.(?:io|com)|pendo\.io|nr-data\.net|hotjar\.com"
+)
+
+
+async def _block_resources(route) -> None:
+    request = route.request
+    if request.resource_type in _BLOCKED_RESOURCE_TYPES or _TRACKER_RE.search(request.url):
+        await route.abort()
+    else:
+        await route.continue_()
+
+
+async def block_page_resources(page) -> None:
+    """Abort asset and tracker requests on *page*; documents, scripts and XHR still load."""
+    await page.route("**/*", _block_resources)
+
+
 # ---------------------------------------------------------------------------
 # Single-page extraction
 # ---------------------------------------------------------------------------
 
-def extract_links_from_page(page) -> list[dict]:
+async def extract_links_from_page(page) -> dict:
     """Return deduplicated link records from the current page.
 
-    Each record contains:
+    The result is ``{"links": [...], "video_count": N}`` where *N* counts
+    the records with a video provider.  Each record contains:
     ``text``, ``href``, ``link_type`` (``"anchor"`` | ``"iframe"``),
     ``video_provider`` (provider name or ``None``).
     """
-    raw = page.evaluate("""() => {
-        const results = [];
+    # Filtering and deduplication happen page-side so each href crosses the
+    # CDP connection only once.
+    raw = await page.evaluate("""() => {
+        const unique = new Map();
+        const skip = href => !href || unique.has(href) || href.startsWith('javascript:') ||
+                             href.startsWith('about:') || href.startsWith('#');
 
         document.querySelectorAll('a[href]').forEach(a => {
-            results.push({
+            const href = a.href;
+            if (skip(href)) return;
+            unique.set(href, {
                 type: 'anchor',
                 text: a.textContent.trim().substring(0, 200),
-                href: a.href,
+                href,
             });
         });
 
         document.querySelectorAll('iframe[src]').forEach(f => {
-            const src = f.src;
-            if (src && !src.startsWith('about:') && !src.startsWith('javascript:'))
-                results.push({
-                    type: 'iframe',
-                    text: f.title || f.getAttribute('aria-label') || 'Embedded iframe',
-                    href: src,
-                });
+            const href = f.src;
+            if (skip(href)) return;
+            unique.set(href, {
+                type: 'iframe',
+                text: f.title || f.getAttribute('aria-label') || 'Embedded iframe',
+                href,
+            });
         });
 
-        return results;
+        return [...unique.values()];
     }""")
 
-    unique: dict[str, dict] = {}
+    links = []
+    video_count = 0
     for item in raw:
-        href = item.get("href", "")
-        if not href or href.startswith(("javascript:", "about:", "#")):
-            continue
-        if href in unique:
-            continue
-        unique[href] = {
+        provider = detect_video_provider(item["href"])
+        if provider:
+            video_count += 1
+        links.append({
             "text": item["text"],
-            "href": href,
-            "link_type": item.get("type", "anchor"),
-            "video_provider": detect_video_provider(href),
-        }
-    return list(unique.values())
+            "href": item["href"],
+            "link_type": item["type"],
+            "video_provider": provider,
+        })
+    return {"links": links, "video_count": video_count}
 
 
 # ---------------------------------------------------------------------------
 # Modules-page crawl
 # ---------------------------------------------------------------------------
 
-def _extract_module_item_links(page) -> list[dict]:
-    """Return all module item links with their parent module name."""
-    return page.evaluate("""() => {
+# Canvas tags each module item <li> with a class naming its content type.
+_MODULE_ITEM_CLASSES: dict[str, str] = {
+    "wiki_page":             "page",
+    "assignment":            "assignment",
+    "quiz":                  "quiz",
+    "discussion_topic":      "discussion",
+    "attachment":            "file",
+    "external_url":          "external_url",
+    "context_external_tool": "external_tool",
+}
+
+MODULE_ITEM_TYPES: tuple[str, ...] = tuple(_MODULE_ITEM_CLASSES.values())
+
+# Quizzes and file previews never embed lecture videos, so they are not
+# visited unless asked for.
+DEFAULT_EXCLUDED_TYPES = frozenset({"quiz", "file"})
+
+
+async def _extract_module_item_links(page) -> list[dict]:
+    """Return all module item links with their parent module name and type."""
+    items = await page.evaluate("""(classes) => {
         const results = [];
         document.querySelectorAll('.context_module').forEach(mod => {
             const nameEl = mod.querySelector('.ig-header .name, .ig-header strong');
@@ -102,56 +177,125 @@ def _extract_module_item_links(page) -> list[dict]:
                 ? nameEl.textContent.trim()
                 : (mod.getAttribute('aria-label') || 'Unknown Module');
             mod.querySelectorAll('a.ig-title[href*="/modules/items/"]').forEach(a => {
+                const li = a.closest('.context_module_item');
                 results.push({
                     module_name: moduleName,
                     text: a.textContent.trim().substring(0, 200),
                     href: a.href,
+                    item_class: li ? (classes.find(c => li.classList.contains(c)) || null) : null,
                 });
             });
         });
         return results;
-    }""")
+    }""", list(_MODULE_ITEM_CLASSES))
+    for item in items:
+        item["item_type"] = _MODULE_ITEM_CLASSES.get(item.pop("item_class"))
+    return items
 
 
-def extract_links_from_modules_page(page, context) -> list[dict]:
+async def extract_links_from_modules_page(
+    page,
+    context,
+    concurrency: int = 4,
+    block_resources: bool = True,
+    include_types: Optional[frozenset] = None,
+    exclude_types: frozenset = DEFAULT_EXCLUDED_TYPES,
+) -> dict:
     """Crawl every module item on a Canvas */modules* page.
 
     Navigates each ``/modules/items/{id}`` URL, collects video links from the
     destination page, and attaches ``module_name`` + ``canvas_item_text`` to
-    each link record for downstream organisation.
+    each link record for downstream organisation.  Returns the same shape as
+    ``extract_links_from_page``; every link returned is a video link.
+
+    Up to *concurrency* items are loaded in parallel; results are merged in
+    module order so the first item that links a video always owns it.  With
+    *block_resources* the item pages skip images, fonts, media and styles.
+
+    Items are filtered by their Canvas content type before any navigation:
+    only *include_types* are visited when given, otherwise everything except
+    *exclude_types*.  Items of unrecognised type are always visited unless
+    *include_types* is set.
     """
     print(f"    Reading module structure...")
-    items = _extract_module_item_links(page)
-    print(f"    Found {len(items)} module items to check")
+    all_items = await _extract_module_item_links(page)
+    if include_types is not None:
+        items = [it for it in all_items if it["item_type"] in include_types]
+    else:
+        items = [it for it in all_items if it["item_type"] not in exclude_types]
+    skipped = len(all_items) - len(items)
+    print(f"    Found {len(all_items)} module items, checking {len(items)}"
+          + (f" ({skipped} skipped by type)" if skipped else ""))
+    if not items:
+        return {"links": [], "video_count": 0}
 
-    all_video_links: dict[str, dict] = {}
-    check_page = context.new_page()
+    # A fixed pool of pages is shared by all items; the queue doubles as the
+    # concurrency limit.
+    pool: asyncio.Queue = asyncio.Queue()
+    pages = [await context.new_page() for _ in range(max(min(concurrency, len(items)), 1))]
+    for check_page in pages:
+        if block_resources:
+            await block_page_resources(check_page)
+        pool.put_nowait(check_page)
+
+    total = len(items)
+    completed = with_video = failed = 0
+    # On a terminal progress is one status line rewritten in place, with
+    # only errors kept on their own lines; piped output gets a line per item
+    live = sys.stdout.isatty()
 
-    for i, item in enumerate(items, 1):
-        href = item["href"]
+    def _report(item: dict, extracted: Optional[dict], error: Optional[Exception]) -> None:
+        # Progress is reported as items finish, numbered in completion order
+        nonlocal completed, with_video, failed
+        completed += 1
         text = item["text"]
-        module_name = item["module_name"]
-        try:
-            check_page.goto(href, timeout=20000)
-            check_page.wait_for_load_state("domcontentloaded", timeout=20000)
-
-            for link in extract_links_from_page(check_page):
-                if not link.get("video_provider"):
-                    continue
-                lhref = link["href"]
-                if lhref not in all_video_links:
-                    link["module_name"] = module_name
-                    link["canvas_item_text"] = text
-                    all_video_links[lhref] = link
-                    print(f"  [{i:3d}/{len(items)}] [{link['video_provider']}] "
-                          f"{module_name[:30]} / {text[:40]}")
-
-            if not any(l["href"] == href for l in all_video_links.values()):
-                # Only print "no video" once per item to avoid repetition
-                print(f"  [{i:3d}/{len(items)}] (no video) {text[:60]}")
+        if error is not None:
+            failed += 1
+            line = f"  [{completed:3d}/{total}] Error — {text[:40]}: {error}"
+        elif extracted["video_count"]:
+            with_video += 1
+            providers = sorted({l["video_provider"] for l in extracted["links"] if l["video_provider"]})
+            line = (f"  [{completed:3d}/{total}] [{', '.join(providers)}] "
+                    f"{item['module_name'][:30]} / {text[:40]}")
+        else:
+            line = f"  [{completed:3d}/{total}] (no video) {text[:60]}"
+        if not live:
+            print(line)
+            return
+        if error is not None:
+            sys.stdout.write(f"\r\033[K{line}\n")
+        sys.stdout.write(f"\r\033[K    Checked {completed}/{total} items — {with_video} with video"
+                         + (f", {failed} failed" if failed else ""))
+        sys.stdout.flush()
 
+    async def _check(item: dict) -> tuple[Optional[dict], Optional[Exception]]:
+        check_page = await pool.get()
+        try:
+            await check_page.goto(item["href"], wait_until="domcontentloaded", timeout=20000)
+            extracted, error = await extract_links_from_page(check_page), None
         except Exception as e:
-            print(f"  [{i:3d}/{len(items)}] Error — {text[:40]}: {e}")
+            extracted, error = None, e
+        finally:
+            pool.put_nowait(check_page)
+        _report(item, extracted, error)
+        return extracted, error
+
+    try:
+        checked = await asyncio.gather(*(_check(item) for item in items))
+    finally:
+        if live:
+            print()
+        await asyncio.gather(*(p.close() for p in pages))
+
+    # Merged in module order so the first item that links a video owns it
+    all_video_links: dict[str, dict] = {}
+    for item, (extracted, error) in zip(items, checked):
+        if error is not None or not extracted["video_count"]:
+            continue
+        for link in extracted["links"]:
+            if link["video_provider"] and link["href"] not in all_video_links:
+                link["module_name"] = item["module_name"]
+                link["canvas_item_text"] = item["text"]
+                all_video_links[link["href"]] = link
 
-    check_page.close()
-    return list(all_video_links.values())
+    return {"links": list(all_video_links.values()), "video_count": len(all_video_links)}
@@ -0,0 +1,49 @@
+"""
+JSON file helpers.
+
+Links, metadata and session files all go through these functions so the
+encoder can be swapped in one place.  orjson is used when installed; the
+standard library is the fallback.
+"""
+
+import json
+import mmap
+import os
+from pathlib import Path
+from typing import Any
+
+try:
+    import orjson
+except ImportError:
+    orjson = None  # orjson is optional; fall back to the stdlib json module
+
+
+def loads(data: bytes) -> Any:
+    """Parse JSON from *data*."""
+    if orjson is not None:
+        return orjson.loads(data)
+    return json.loads(data)
+
+
+def dumps(obj: Any, indent: bool = False) -> bytes:
+    """Serialise *obj* to UTF-8 JSON bytes, optionally indented by 2 spaces."""
+    if orjson is not None:
+        return orjson.dumps(obj, option=orjson.OPT_INDENT_2 if indent else 0)
+    return json.dumps(obj, indent=2 if indent else None, ensure_ascii=False).encode("utf-8")
+
+
+def read_json(path: Path) -> Any:
+    """Load and return the JSON document stored at *path*."""
+    with open(path, "rb") as f:
+        if orjson is not None and os.fstat(f.fileno()).st_size:
+            # orjson parses straight from the mapped file, so large links and
+            # metadata files are never copied into a bytes object first
+            with mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ) as mm, memoryview(mm) as view:
+                return orjson.loads(view)
+        return loads(f.read())
+
+
+def write_json(path: Path, obj: Any, indent: bool = True) -> None:
+    """Write *obj* to *path* as JSON."""
+    with open(path, "wb") as f:
+        f.write(dumps(obj, indent=indent))
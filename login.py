@@ -1,80 +1,203 @@
 """
 Canvas session management.
 
-Handles loading/saving Playwright browser cookies and waiting for the user
+Handles loading/saving the Playwright storage state (cookies + local
+storage) and waiting for the user
 to complete SSO/MFA login in the non-headless browser window.
 """
 
-import json
+import asyncio
+import re
+import sys
 import time
 from pathlib import Path
+from typing import Optional
 
+from playwright.async_api import TimeoutError as PlaywrightTimeoutError
 
-def load_session(context, session_file: Path) -> bool:
-    """Load session cookies from *session_file* into *context*.
+from jsonio import read_json
 
-    Returns True on success, False if the file is missing or malformed.
+
+def load_session(session_file: Path) -> Optional[dict]:
+    """Return the Playwright storage state saved in *session_file*.
+
+    Also accepts the bare cookie list written by older versions.  Returns
+    None if the file is missing or malformed.
     """
     try:
-        with open(session_file, "r") as f:
-            cookies = json.load(f)
-        context.add_cookies(cookies)
-        return True
+        state = read_json(session_file)
+    except FileNotFoundError:
+        return None
     except Exception as e:
         print(f"Could not load session: {e}")
-        return False
+        return None
+    if isinstance(state, list):
+        state = {"cookies": state, "origins": []}
+    return state
 
 
-def save_session(context, session_file: Path) -> None:
-    """Persist the current browser cookies to *session_file*."""
-    cookies = context.cookies()
-    with open(session_file, "w") as f:
-        json.dump(cookies, f)
+async def save_session(context, session_file: Path) -> None:
+    """Persist the browser's cookies and local storage to *session_file*."""
+    await context.storage_state(path=session_file)
     print(f"Session saved to {session_file}")
 
 
-def wait_for_canvas_login(page, timeout: int = 180) -> bool:
-    """Block until the browser lands on an authenticated Canvas course page.
+_CANVAS_DOM_SELECTOR = "#content, .user_content, .ic-app"
 
-    Polls every 2 seconds.  When it detects a login/SSO page it prompts the
-    user to complete authentication and press Enter.
+_LOGIN_URL_RE = re.compile(r"login|sso|saml", re.IGNORECASE)
 
-    Returns True if login succeeded, False if *timeout* was reached or the
-    user chose to quit.
+
+def is_login_url(url: str) -> bool:
+    """Return True if *url* looks like a Canvas login or SSO/SAML page."""
+    return _LOGIN_URL_RE.search(url) is not None
+
+
+def _on_canvas_course(url: str) -> bool:
+    return "instructure.com/courses/" in url.lower()
+
+
+async def _first_completed(*aws):
+    """Return the result of whichever awaitable finishes first; cancel the rest."""
+    tasks = [asyncio.ensure_future(aw) for aw in aws]
+    try:
+        done, _ = await asyncio.wait(tasks, return_when=asyncio.FIRST_COMPLETED)
+    finally:
+        pending = [t for t in tasks if not t.done()]
+        for t in pending:
+            t.cancel()
+        await asyncio.gather(*pending, return_exceptions=True)
+    # Prefer a success when several finished together; otherwise re-raise
+    errors = [t.exception() for t in done]
+    for task, error in zip(done, errors):
+        if error is None:
+            return task.result()
+    raise errors[0]
+
+
+def _watch_stdin() -> Optional[asyncio.Future]:
+    """Return a future for the next line typed on stdin, without blocking.
+
+    Returns None where the event loop cannot watch stdin (e.g. Windows or a
+    closed stdin); callers then fall back to a blocking ``input()``.
+    Cancelling the future stops watching, so no later prompt loses a line.
     """
-    print("\n--- Waiting for Canvas login ---")
-    start = time.time()
+    loop = asyncio.get_running_loop()
+    try:
+        fd = sys.stdin.fileno()
+    except (AttributeError, ValueError, OSError):
+        return None
+    line: asyncio.Future = loop.create_future()
 
-    while time.time() - start < timeout:
-        current_url = page.url
-        page_title = page.title()
+    def _read() -> None:
+        if not line.done():
+            line.set_result(sys.stdin.readline())
 
-        on_canvas = "instructure.com/courses/" in current_url.lower()
-        not_login_title = "login" not in page_title.lower()
-        has_canvas_dom = page.evaluate(
-            "() => document.querySelector('#content, .user_content, .ic-app') !== null"
-        )
+    try:
+        loop.add_reader(fd, _read)
+    except (NotImplementedError, ValueError, OSError):
+        return None
+    line.add_done_callback(lambda _: loop.remove_reader(fd))
+    return line
 
-        if on_canvas and (not_login_title or has_canvas_dom):
-            print(f"Logged in — {page_title}")
-            return True
 
-        on_login_page = any(
-            k in current_url.lower() for k in ("sso", "login", "saml")
+async def wait_for_canvas_login(page, timeout: int = 180) -> bool:
+    """Block until the browser lands on an authenticated Canvas course page.
+
+    Waits on Playwright navigation events instead of polling, racing the
+    course-URL wait against the Canvas DOM appearing.  When the browser
+    starts on a login/SSO page the user is told to complete authentication;
+    login is detected on its own, but pressing Enter forces a check and 'q'
+    gives up.
+
+    Returns True if login succeeded, False if *timeout* was reached or the
+    user chose to quit.
+    """
+    print("\n--- Waiting for Canvas login ---")
+    deadline = time.monotonic() + timeout
+
+    prompt = None
+    prompt_line_open = False  # cursor still sits after the prompt text
+    if is_login_url(page.url):
+        message = (
+            f"Complete SSO/MFA in the browser — login is detected automatically. "
+            f"Press Enter to check now, or 'q' to quit [{timeout}s]: "
         )
-        if on_login_page:
-            remaining = int(timeout - (time.time() - start))
+        prompt = _watch_stdin()
+        if prompt is None:
             try:
-                answer = input(
-                    f"Complete SSO/MFA in the browser, then press Enter "
-                    f"(or 'q' to quit) [{remaining}s left]: "
-                ).strip().lower()
+                answer = input(message).strip().lower()
             except EOFError:
                 answer = ""
             if answer == "q":
                 return False
+        else:
+            print(message, end="", flush=True)
+            prompt_line_open = True
+
+    async def _wait(*aws) -> None:
+        # Let a pending prompt answer cut any wait short
+        if prompt is not None and not prompt.done():
+            aws += (asyncio.shield(prompt),)
+        await _first_completed(*aws)
+
+    def _quit_requested() -> bool:
+        # Consume a prompt answer once it arrives; Enter forces a check and
+        # keeps listening so 'q' still works afterwards
+        nonlocal prompt, prompt_line_open
+        if prompt is None or not prompt.done():
+            return False
+        answer = prompt.result()
+        prompt_line_open = False
+        if answer.strip().lower() == "q":
+            prompt = None
+            return True
+        prompt = _watch_stdin() if answer else None
+        return False
 
-        time.sleep(2)
+    def _end_prompt_line() -> None:
+        if prompt_line_open:
+            print()
 
-    print(f"Login timed out after {timeout}s.")
-    return False
+    try:
+        while True:
+            remaining_ms = max(deadline - time.monotonic(), 0.001) * 1000
+            await _wait(
+                page.wait_for_url(
+                    _on_canvas_course, wait_until="domcontentloaded", timeout=remaining_ms
+                ),
+                page.wait_for_selector(
+                    _CANVAS_DOM_SELECTOR, state="attached", timeout=remaining_ms
+                ),
+            )
+            if _quit_requested():
+                return False
+
+            # URL, title and DOM check in one round trip
+            state = await page.evaluate(
+                """(selector) => ({
+                    url: location.href,
+                    title: document.title,
+                    hasContent: document.querySelector(selector) !== null,
+                })""",
+                _CANVAS_DOM_SELECTOR,
+            )
+            page_title = state["title"]
+            if _on_canvas_course(state["url"]) and (
+                "login" not in page_title.lower() or state["hasContent"]
+            ):
+                _end_prompt_line()
+                print(f"Logged in — {page_title}")
+                return True
+
+            # Still on a login screen — wait for the next navigation
+            remaining_ms = max(deadline - time.monotonic(), 0.001) * 1000
+            await _wait(page.wait_for_event("framenavigated", timeout=remaining_ms))
+            if _quit_requested():
+                return False
+    except PlaywrightTimeoutError:
+        _end_prompt_line()
+        print(f"Login timed out after {timeout}s.")
+        return False
+    finally:
+        if prompt is not None:
+            prompt.cancel()
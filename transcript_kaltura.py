@@ -7,11 +7,57 @@ Core functions used by the CLI (cli.py) to:
   3. Deep-debug a single video page (--debug mode).
 """
 
-import json
+import asyncio
 import re
 import time
 import requests
-from typing import Optional
+from functools import lru_cache
+from typing import Callable, Optional
+
+from requests.adapters import HTTPAdapter
+from urllib3.util import Retry
+
+from jsonio import loads
+
+
+# One pooled HTTP session for caption downloads, so repeated fetches from the
+# same Kaltura CDN host reuse their keep-alive connections.  Transient CDN
+# errors are retried with a short backoff instead of failing the video; once
+# retries run out the last response is returned, so ``raise_for_status``
+# still reports its status code.
+_HTTP = requests.Session()
+_HTTP.mount("https://", HTTPAdapter(
+    pool_connections=8,
+    pool_maxsize=16,
+    max_retries=Retry(
+        total=2, backoff_factor=0.5, status_forcelist=(502, 503, 504), raise_on_status=False
+    ),
+))
+
+
+async def _share_browser_cookies(context) -> None:
+    """Copy the browser *context*'s cookies into the HTTP session.
+
+    Caption tracks hosted behind the Canvas login need the session cookies;
+    each cookie keeps its domain and path so it is only sent where the
+    browser would send it.
+    """
+    for c in await context.cookies():
+        _HTTP.cookies.set(c["name"], c["value"], domain=c["domain"], path=c["path"])
+
+
+@lru_cache(maxsize=256)
+def _fetch_caption_text(url: str, timeout: float) -> str:
+    """Download *url* and return its body text.
+
+    Cached per URL for the life of the process: the same track URL is often
+    shared by several videos in a course, and the late-API retry requests
+    the same serve URLs again.  Non-2xx responses raise ``HTTPError`` and
+    are therefore never cached.
+    """
+    resp = _HTTP.get(url, timeout=timeout)
+    resp.raise_for_status()
+    return resp.text
 
 
 # ---------------------------------------------------------------------------
@@ -32,7 +78,12 @@ _CSS_PATTERNS = [
     r"__webpack_require__",
 ]
 
-_REJECT_PATTERNS = [re.compile(p, re.IGNORECASE) for p in _CSS_PATTERNS]
+# One alternation with a capturing group per pattern; ``lastindex`` maps a
+# match back to the pattern that produced it.
+_REJECT_RE = re.compile("|".join(f"({p})" for p in _CSS_PATTERNS), re.IGNORECASE)
+
+
+_ALPHA_SLICE = 2048
 
 
 def validate_transcript(text: str) -> tuple[bool, Optional[str]]:
@@ -40,157 +91,195 @@ def validate_transcript(text: str) -> tuple[bool, Optional[str]]:
     if not text or len(text) < 50:
         return False, "too_short"
 
-    for pattern in _REJECT_PATTERNS:
-        if pattern.search(text):
-            return False, f"css_pattern_match:{pattern.pattern}"
+    m = _REJECT_RE.search(text)
+    if m:
+        return False, f"css_pattern_match:{_CSS_PATTERNS[m.lastindex - 1]}"
 
     if text.count("{") > 5 or text.count(";") > 10:
         return False, "too_many_braces"
 
-    alpha_ratio = sum(c.isalpha() for c in text) / max(len(text), 1)
-    if alpha_ratio < 0.3:
-        return False, "low_alpha_ratio"
-
     if len(text.split()) < 10:
         return False, "not_enough_words"
 
-    return True, None
+    # At least 30% of characters must be letters.  They are counted in 2 KB
+    # slices (map() keeps the per-character test in C) and counting stops as
+    # soon as the threshold is reached, so prose rarely needs a full pass.
+    needed = 3 * len(text)
+    alpha = 0
+    for start in range(0, len(text), _ALPHA_SLICE):
+        alpha += sum(map(str.isalpha, text[start:start + _ALPHA_SLICE]))
+        if alpha * 10 >= needed:
+            return True, None
+    return False, "low_alpha_ratio"
 
 
 # ---------------------------------------------------------------------------
 # Caption file parsing
 # ---------------------------------------------------------------------------
 
-def parse_vtt_to_text(vtt_content: str) -> str:
-    """Extract plain transcript text from a VTT or SRT caption file."""
-    lines = vtt_content.split("\n")
-    transcript_lines: list[str] = []
+def _cue_text_lines(vtt_content: str):
+    """Yield the caption text lines of a VTT or SRT file, in order."""
     in_cue = False
-
-    for line in lines:
+    for line in vtt_content.splitlines():
         line = line.strip()
         if not line:
             in_cue = False
             continue
-        if line.startswith("WEBVTT") or line.startswith("NOTE"):
+        if line.startswith(("WEBVTT", "NOTE")):
             continue
-        if re.match(r"^\d{2}:\d{2}:\d{2}", line) or re.match(r"^\d{2}:\d{2}", line):
+        # Cue timing line ("00:01.000 --> ..." or "00:00:01.000 --> ...");
+        # an HH:MM:SS prefix always starts with a MM:SS shape, so the fixed
+        # two-digits-colon-two-digits test covers both without a regex
+        if len(line) >= 5 and line[2] == ":" and line[:2].isdigit() and line[3:5].isdigit():
             in_cue = True
             continue
         if "-->" in line:
             in_cue = True
             continue
         if in_cue:
-            transcript_lines.append(line)
+            yield line
+
 
-    return " ".join(transcript_lines)
+def parse_vtt_to_text(vtt_content: str) -> str:
+    """Extract plain transcript text from a VTT or SRT caption file."""
+    return " ".join(_cue_text_lines(vtt_content))
 
 
 # ---------------------------------------------------------------------------
 # Utilities
 # ---------------------------------------------------------------------------
 
+# Characters not allowed in Windows filenames, each replaced by a space.
+_FILENAME_TABLE = str.maketrans(dict.fromkeys('<>:"/\\|?*', " "))
+
+
 def sanitize_filename(text: str) -> str:
     """Return a filesystem-safe filename stem (no extension) from *text*."""
     if not text:
         return "untitled_video"
-    text = re.sub(r'[<>:"/\\|?*]', " ", text)
-    text = text.strip()[:100]
-    return text or "untitled_video"
+    return text.translate(_FILENAME_TABLE).strip()[:100] or "untitled_video"
 
 
 # ---------------------------------------------------------------------------
 # DOM / UI extraction (fallback)
 # ---------------------------------------------------------------------------
 
-def extract_kaltura_transcript(page) -> tuple[Optional[str], Optional[str], Optional[str], Optional[str]]:
+# A button's own text plus that of its leaf children; never the whole
+# subtree, which for panels can be the full transcript.  Shared by the
+# scripts below, which splice it in as their ``labelOf`` helper.
+_JS_LABEL_OF = """el => el.childElementCount === 0 ? (el.textContent || '') :
+    Array.from(el.childNodes, n => n.nodeType === 3 ? n.nodeValue :
+        (n.childElementCount === 0 ? n.textContent : '')).join('')"""
+
+# Page-side half of extract_kaltura_transcript: a visible transcript panel,
+# else a <track> URL, else a visible transcript/CC button.
+_JS_DOM_TRANSCRIPT = """() => {
+    // The title rides along for logging instead of costing its own round trip
+    const out = { title: document.title, transcript: null, source: null, selector: null, vttUrl: null };
+
+    const selectors = [
+        '[class*="transcript"]', '[id*="transcript"]',
+        '[class*="caption"]',
+        '[role="tabpanel"]:not([aria-hidden="true"])',
+        '[aria-label*="transcript"]', '[aria-label*="caption"]',
+        '[data-testid*="transcript"]',
+        '.kaltura-transcript', '.transcript-panel', '.captions-panel'
+    ];
+
+    // One DOM walk for all selectors; earlier selectors still win, so
+    // each node is ranked and only improvements are measured
+    let best = selectors.length;
+    for (const el of document.querySelectorAll(selectors.join(','))) {
+        const tag = el.tagName.toLowerCase();
+        if (tag === 'script' || tag === 'style' || tag === 'noscript') continue;
+        const rank = selectors.findIndex(sel => el.matches(sel));
+        if (rank >= best) continue;
+        const rect = el.getBoundingClientRect();
+        if (rect.width > 0 && rect.height > 0) {
+            const text = el.textContent?.trim();
+            if (text && text.length > 50 && text.length < 50000) {
+                out.transcript = text;
+                out.source = 'ui_panel';
+                out.selector = selectors[rank];
+                best = rank;
+                if (rank === 0) break;
+            }
+        }
+    }
+    if (out.transcript) return out;
+
+    const tracks = document.querySelectorAll('track[kind="subtitles"], track[kind="captions"]');
+    if (tracks.length > 0) {
+        out.vttUrl  = tracks[0].src;
+        out.source  = 'vtt_track';
+        out.selector = 'track[kind="subtitles"]';
+        return out;
+    }
+
+    const label = /transcript|caption|subtitle|\\bcc\\b/i;
+    const labelOf = """ + _JS_LABEL_OF + """;
+    for (const btn of document.querySelectorAll('button, a, div[role="button"]')) {
+        if (!label.test(labelOf(btn)) &&
+            !label.test(btn.getAttribute('aria-label') || '')) continue;
+        const rect = btn.getBoundingClientRect();
+        if (rect.width > 0 && rect.height > 0) {
+            out.source   = 'ui_button_found';
+            out.selector = btn.tagName + (btn.className ? '.' + btn.className.split(' ').join('.') : '');
+            return out;
+        }
+    }
+
+    return out;
+}"""
+
+
+async def extract_kaltura_transcript(
+    page, metadata: Optional[dict] = None, log: Callable[[str], None] = print,
+) -> tuple[Optional[str], Optional[str], Optional[str], Optional[str]]:
     """Try to read transcript text from the Kaltura player DOM.
 
     Returns *(text, source_type, selector_info, error_message)*.
     Any element may be None.
+
+    If a *metadata* dict is given, the same evaluate also collects what
+    ``extract_video_metadata`` would return and stores it there, saving the
+    caller a second round trip.  Progress lines go to *log*.
     """
     transcript_text: Optional[str] = None
     transcript_source: Optional[str] = None
     selector_info: Optional[str] = None
     error_msg: Optional[str] = None
 
-    print(f"    Page URL:   {page.url}")
-    print(f"    Page title: {page.title()}")
+    log(f"    Page URL:   {page.url}")
 
     try:
-        result = page.evaluate("""() => {
-            const out = { transcript: null, source: null, selector: null, vttUrl: null };
-
-            const selectors = [
-                '[class*="transcript"]', '[id*="transcript"]',
-                '[class*="caption"]',
-                '[role="tabpanel"]:not([aria-hidden="true"])',
-                '[aria-label*="transcript"]', '[aria-label*="caption"]',
-                '[data-testid*="transcript"]',
-                '.kaltura-transcript', '.transcript-panel', '.captions-panel'
-            ];
-
-            for (const sel of selectors) {
-                for (const el of document.querySelectorAll(sel)) {
-                    const rect = el.getBoundingClientRect();
-                    if (rect.width > 0 && rect.height > 0) {
-                        const tag = el.tagName.toLowerCase();
-                        if (tag === 'script' || tag === 'style' || tag === 'noscript') continue;
-                        const text = el.textContent?.trim();
-                        if (text && text.length > 50 && text.length < 50000) {
-                            out.transcript = text;
-                            out.source = 'ui_panel';
-                            out.selector = sel;
-                            return out;
-                        }
-                    }
-                }
-            }
-
-            const tracks = document.querySelectorAll('track[kind="subtitles"], track[kind="captions"]');
-            if (tracks.length > 0) {
-                out.vttUrl  = tracks[0].src;
-                out.source  = 'vtt_track';
-                out.selector = 'track[kind="subtitles"]';
-                return out;
-            }
-
-            for (const btn of document.querySelectorAll('button, a, div[role="button"]')) {
-                const t = (btn.textContent || '').toLowerCase();
-                if (t.includes('transcript') || t.includes('cc') ||
-                    t.includes('captions') || t.includes('subtitle')) {
-                    const rect = btn.getBoundingClientRect();
-                    if (rect.width > 0 && rect.height > 0) {
-                        out.source   = 'ui_button_found';
-                        out.selector = btn.tagName + (btn.className ? '.' + btn.className.split(' ').join('.') : '');
-                        return out;
-                    }
-                }
-            }
-
-            return out;
-        }""")
+        if metadata is None:
+            result = await page.evaluate(_JS_DOM_TRANSCRIPT)
+        else:
+            result, page_metadata = await page.evaluate(_JS_TRANSCRIPT_AND_METADATA)
+            metadata.update(page_metadata)
 
+        log(f"    Page title: {result.get('title')}")
         transcript_text = result.get("transcript")
         transcript_source = result.get("source")
         selector_info = result.get("selector")
         vtt_url = result.get("vttUrl")
 
         if vtt_url and not transcript_text:
-            print(f"    Found VTT track URL: {vtt_url}")
+            log(f"    Found VTT track URL: {vtt_url}")
             try:
-                resp = requests.get(vtt_url, timeout=10)
-                if resp.status_code == 200:
-                    transcript_text = parse_vtt_to_text(resp.text)
-                    transcript_source = "vtt_fetch"
-                    selector_info = vtt_url
+                await _share_browser_cookies(page.context)
+                body = await asyncio.to_thread(_fetch_caption_text, vtt_url, 10)
+                transcript_text = parse_vtt_to_text(body)
+                transcript_source = "vtt_fetch"
+                selector_info = vtt_url
             except Exception as e:
                 error_msg = f"VTT fetch failed: {e}"
-                print(f"    Warning: {error_msg}")
+                log(f"    Warning: {error_msg}")
 
     except Exception as e:
         error_msg = f"DOM extraction error: {e}"
-        print(f"    Warning: {error_msg}")
+        log(f"    Warning: {error_msg}")
 
     return transcript_text, transcript_source, selector_info, error_msg
 
@@ -199,35 +288,54 @@ def extract_kaltura_transcript(page) -> tuple[Optional[str], Optional[str], Opti
 # Video metadata
 # ---------------------------------------------------------------------------
 
-def extract_video_metadata(page) -> dict:
-    """Return basic video metadata from the current page."""
-    return page.evaluate("""() => {
-        const data = { title: null, duration: null, kaltura_entry_id: null };
+# Page-side half of extract_video_metadata.
+_JS_VIDEO_METADATA = """() => {
+    const data = { title: null, duration: null, kaltura_entry_id: null };
 
-        const titleEl = document.querySelector('h1, h2, [class*="title"], [itemprop="name"]');
-        if (titleEl) data.title = titleEl.textContent?.trim();
+    const titleEl = document.querySelector('h1, h2, [class*="title"], [itemprop="name"]');
+    if (titleEl) data.title = titleEl.textContent?.trim();
 
-        const og = document.querySelector('meta[property="og:title"]');
-        if (og) data.title = og.content || data.title;
+    const og = document.querySelector('meta[property="og:title"]');
+    if (og) data.title = og.content || data.title;
 
-        for (const script of document.querySelectorAll('script')) {
-            const c = script.textContent || '';
-            const m = c.match(/entryId["']?\\s*:\\s*["']?([a-z0-9_]+)/i);
-            if (m) { data.kaltura_entry_id = m[1]; break; }
-        }
+    // All inline scripts in one string (NUL-separated so no match spans
+    // two scripts), searched once
+    const scripts = Array.from(document.querySelectorAll('script'), s => s.textContent || '')
+        .join('\\n\\u0000\\n');
+    const m = scripts.match(/entryId["']?\\s*:\\s*["']?([a-z0-9_]+)/i);
+    if (m) data.kaltura_entry_id = m[1];
+
+    const dur = document.querySelector('[class*="duration"], [class*="time"]');
+    if (dur) data.duration = dur.textContent?.trim();
+
+    return data;
+}"""
 
-        const dur = document.querySelector('[class*="duration"], [class*="time"]');
-        if (dur) data.duration = dur.textContent?.trim();
 
-        return data;
-    }""")
+# Both scripts in one evaluate, for callers that need the two together.
+_JS_TRANSCRIPT_AND_METADATA = (
+    "() => [(" + _JS_DOM_TRANSCRIPT + ")(), (" + _JS_VIDEO_METADATA + ")()]"
+)
+
+
+async def extract_video_metadata(page) -> dict:
+    """Return basic video metadata from the current page."""
+    return await page.evaluate(_JS_VIDEO_METADATA)
 
 
 # ---------------------------------------------------------------------------
 # Primary extraction: Kaltura caption API via network interception
 # ---------------------------------------------------------------------------
 
-def process_kaltura_link(page, link_data: dict, session_context, browser) -> dict:
+def _is_caption_url_request(response) -> bool:
+    """True for the Kaltura player's ``caption_captionasset/getUrl`` API call."""
+    url_lower = response.url.lower()
+    return "caption_captionasset" in url_lower and "geturl" in url_lower
+
+
+async def process_kaltura_link(
+    page, link_data: dict, log: Callable[[str], None] = print,
+) -> dict:
     """Extract the transcript for one Kaltura video link.
 
     Strategy:
@@ -236,19 +344,22 @@ def process_kaltura_link(page, link_data: dict, session_context, browser) -> dic
        serve URL, then fetch that URL directly.
     2. If the signed URL arrives after the polling window (some players
        initialise slowly), a second-chance fetch is attempted after the DOM
-       scrape fallback.
+       scrape fallback (Canvas external-tool links only).
     3. As a last resort, scrape the transcript panel from the DOM.
 
+    Progress lines go to *log* (``print`` by default); concurrent callers
+    pass a per-video buffer so lines from different videos do not interleave.
+
     Returns a result dict (without ``transcript_text`` stripped — callers
     decide what to persist in metadata vs. the .txt file).
     """
     href = link_data.get("href", "")
     text = link_data.get("text", "").strip()
 
-    print(f"\n{'=' * 60}")
-    print(f"Processing: {text[:60]}")
-    print(f"URL: {href}")
-    print(f"{'=' * 60}")
+    log(f"\n{'=' * 60}")
+    log(f"Processing: {text[:60]}")
+    log(f"URL: {href}")
+    log(f"{'=' * 60}")
 
     result: dict = {
         "title": text or "Unknown",
@@ -268,49 +379,74 @@ def process_kaltura_link(page, link_data: dict, session_context, browser) -> dic
     }
 
     try:
-        print(f"    Opening video page...")
-
-        if "external_tools/retrieve" in href:
-            new_page = session_context.new_page()
-            caption_serve_urls: list[str] = []
-
-            def _capture(response) -> None:
-                url_lower = response.url.lower()
-                if "caption_captionasset" in url_lower and "geturl" in url_lower:
-                    try:
-                        data = json.loads(response.text())
-                        if isinstance(data, list):
-                            for item in data:
-                                if isinstance(item, str) and len(item) > 10:
-                                    caption_serve_urls.append(item)
-                                    print(f"    [network] Caption serve URL intercepted")
-                    except Exception:
-                        pass
-
-            new_page.on("response", _capture)
-            new_page.goto(href)
-            new_page.wait_for_load_state("domcontentloaded", timeout=30000)
-
-            # Poll up to 15 s for the caption URL (fast path)
-            wait_start = time.time()
-            while not caption_serve_urls and (time.time() - wait_start) < 15:
-                time.sleep(0.5)
-            elapsed = time.time() - wait_start
+        log(f"    Opening video page...")
+
+        # Both kinds of link load the Kaltura player, which requests its
+        # caption serve URL while initialising
+        caption_serve_urls: list[str] = []
+        caption_arrived = asyncio.Event()
+        meta: dict = {}
+
+        async def _capture(response) -> None:
+            if (_is_caption_url_request(response)
+                    and response.ok
+                    and "json" in response.headers.get("content-type", "")):
+                try:
+                    data = loads(await response.body())
+                    if isinstance(data, list):
+                        for item in data:
+                            if isinstance(item, str) and len(item) > 10:
+                                caption_serve_urls.append(item)
+                                caption_arrived.set()
+                                log(f"    [network] Caption serve URL intercepted")
+                except Exception:
+                    pass
+
+        # Leave the previous video before listening, so a late getUrl
+        # response from it cannot be taken for this video's captions
+        await page.goto("about:blank")
+
+        # Canvas external-tool links go through an LTI launch before the
+        # player loads, so they get longer to produce a caption URL and a
+        # second API attempt after the DOM scrape
+        is_tool = "external_tools/retrieve" in href
+        caption_timeout = 15 if is_tool else 3
+
+        # Reuse the caller's page; only the response listener is per-video
+        page.on("response", _capture)
+        try:
+            await page.goto(href, wait_until="domcontentloaded", timeout=30000)
+            loaded = time.monotonic()
+
+            # Fast path: the listener ends the wait as soon as a caption
+            # serve URL is intercepted
+            try:
+                await asyncio.wait_for(caption_arrived.wait(), timeout=caption_timeout)
+            except asyncio.TimeoutError:
+                pass
+            elapsed = time.monotonic() - loaded
             if caption_serve_urls:
-                print(f"    Caption URL arrived after {elapsed:.1f}s")
+                log(f"    Caption URL arrived after {elapsed:.1f}s")
             else:
-                print(f"    No caption URL after {elapsed:.1f}s")
+                log(f"    No caption URL after {elapsed:.1f}s")
 
-            print(f"    Final URL: {new_page.url}")
+            log(f"    Final URL: {page.url}")
 
             # --- Primary: Kaltura caption API ---
             if caption_serve_urls:
-                result = _fetch_caption_urls(caption_serve_urls, result, label="API")
+                result = await _fetch_caption_urls(
+                    caption_serve_urls, result, label="API", log=log
+                )
 
             # --- Fallback: DOM scraping ---
             if not result["transcript_found"]:
-                print(f"    Falling back to DOM extraction...")
-                transcript, source, selector, error = extract_kaltura_transcript(new_page)
+                # An early caption URL cuts the wait short; give the player
+                # about 3 s from load to build its transcript panel
+                settle = 3 - (time.monotonic() - loaded)
+                if settle > 0:
+                    await asyncio.sleep(settle)
+                log(f"    Falling back to DOM extraction...")
+                transcript, source, selector, error = await extract_kaltura_transcript(page, meta, log)
                 if transcript:
                     is_valid, rejection_reason = validate_transcript(transcript)
                     result.update(
@@ -325,81 +461,79 @@ def process_kaltura_link(page, link_data: dict, session_context, browser) -> dic
                             transcript_source_type=source,
                             transcript_text=transcript,
                         )
-                        print(f"    ✓ Transcript via DOM fallback ({source})")
+                        log(f"    ✓ Transcript via DOM fallback ({source})")
                     else:
                         result["errors"].append(f"DOM transcript rejected: {rejection_reason}")
-                        print(f"    ✗ DOM transcript rejected: {rejection_reason}")
+                        log(f"    ✗ DOM transcript rejected: {rejection_reason}")
                 else:
                     result["errors"].append(error or "No transcript found in DOM")
-                    print(f"    ✗ No transcript in DOM")
+                    log(f"    ✗ No transcript in DOM")
 
             # --- Second chance: URL arrived during DOM scrape ---
-            if not result["transcript_found"] and caption_serve_urls:
-                print(f"    Caption URL arrived late — retrying API...")
+            if is_tool and not result["transcript_found"] and caption_serve_urls:
+                log(f"    Caption URL arrived late — retrying API...")
                 result["errors"].clear()
-                result = _fetch_caption_urls(caption_serve_urls, result, label="late API")
-
-            # Metadata
-            meta = extract_video_metadata(new_page)
-            if meta.get("title") and not result["title"]:
-                result["title"] = meta["title"]
-            if meta.get("kaltura_entry_id") not in (None, "null"):
-                result["kaltura_entry_id"] = meta["kaltura_entry_id"]
-
-            new_page.close()
-
-        else:
-            # Direct Kaltura link (not wrapped in Canvas external_tools)
-            page.goto(href)
-            page.wait_for_load_state("domcontentloaded", timeout=30000)
-            time.sleep(3)
-
-            print(f"    URL: {page.url}")
-            transcript, source, selector, error = extract_kaltura_transcript(page)
-            if transcript:
-                is_valid, rejection_reason = validate_transcript(transcript)
-                result.update(
-                    transcript_candidate_source=source,
-                    transcript_candidate_selector=selector,
-                    transcript_validation_passed=is_valid,
-                    rejection_reason=rejection_reason,
+                result = await _fetch_caption_urls(
+                    caption_serve_urls, result, label="late API", log=log
                 )
-                if is_valid:
-                    result.update(
-                        transcript_found=True,
-                        transcript_source_type=source,
-                        transcript_text=transcript,
-                    )
-                    print(f"    ✓ Transcript via DOM ({source})")
-                else:
-                    result["errors"].append(f"Transcript rejected: {rejection_reason}")
-                    print(f"    ✗ Transcript rejected: {rejection_reason}")
-            else:
-                result["errors"].append(error or "No transcript found")
 
-            meta = extract_video_metadata(page)
+            # Metadata, unless the DOM fallback already collected it
+            if not meta:
+                meta = await extract_video_metadata(page)
             if meta.get("title") and not result["title"]:
                 result["title"] = meta["title"]
             if meta.get("kaltura_entry_id") not in (None, "null"):
                 result["kaltura_entry_id"] = meta["kaltura_entry_id"]
+        finally:
+            page.remove_listener("response", _capture)
 
     except Exception as e:
         msg = f"Navigation/extraction error: {e}"
         result["errors"].append(msg)
-        print(f"    ✗ {msg}")
+        log(f"    ✗ {msg}")
 
     return result
 
 
-def _fetch_caption_urls(serve_urls: list[str], result: dict, label: str = "API") -> dict:
-    """Try each *serve_url* in order; populate *result* on success."""
-    print(f"    Trying Kaltura {label} ({len(serve_urls)} URL(s))...")
-    for serve_url in serve_urls:
+@lru_cache(maxsize=16)
+def _parse_caption_body(body: str) -> tuple[str, bool, Optional[str]]:
+    """Return *(text, is_valid, rejection_reason)* for a caption file body.
+
+    Cached because Kaltura often serves the same file under several signed
+    URLs, and the late-API retry fetches the same URLs again.
+    """
+    text = parse_vtt_to_text(body)
+    return (text, *validate_transcript(text))
+
+
+async def _fetch_caption_urls(
+    serve_urls: list[str], result: dict, label: str = "API", log: Callable[[str], None] = print,
+) -> dict:
+    """Fetch every *serve_url* concurrently; populate *result* from the first valid one.
+
+    Responses are examined in the order they arrive, and the remaining
+    fetches are abandoned as soon as one caption file validates.
+    """
+    log(f"    Trying Kaltura {label} ({len(serve_urls)} URL(s))...")
+
+    async def _get(serve_url: str):
         try:
-            resp = requests.get(serve_url, timeout=15)
-            if resp.status_code == 200 and resp.text.strip():
-                raw_text = parse_vtt_to_text(resp.text)
-                is_valid, rejection_reason = validate_transcript(raw_text)
+            return serve_url, await asyncio.to_thread(_fetch_caption_text, serve_url, 15), None
+        except Exception as e:
+            return serve_url, None, e
+
+    tasks = [asyncio.ensure_future(_get(u)) for u in serve_urls]
+    try:
+        for next_done in asyncio.as_completed(tasks):
+            serve_url, body, error = await next_done
+            if isinstance(error, requests.HTTPError):
+                result["errors"].append(f"{label} serve HTTP {error.response.status_code}")
+                log(f"    ✗ {label} serve returned {error.response.status_code}")
+            elif error is not None:
+                result["errors"].append(f"{label} fetch error: {error}")
+                log(f"    ✗ {label} fetch error: {error}")
+            elif body.strip():
+                raw_text, is_valid, rejection_reason = _parse_caption_body(body)
                 result.update(
                     transcript_candidate_source=f"kaltura_{label.replace(' ', '_')}",
                     transcript_candidate_selector=serve_url,
@@ -412,17 +546,17 @@ def _fetch_caption_urls(serve_urls: list[str], result: dict, label: str = "API")
                         transcript_source_type="kaltura_api_caption",
                         transcript_text=raw_text,
                     )
-                    print(f"    ✓ Transcript via {label}! {len(raw_text):,} chars")
+                    log(f"    ✓ Transcript via {label}! {len(raw_text):,} chars")
                     return result
                 else:
                     result["errors"].append(f"{label} caption rejected: {rejection_reason}")
-                    print(f"    ✗ {label} caption rejected: {rejection_reason}")
+                    log(f"    ✗ {label} caption rejected: {rejection_reason}")
             else:
-                result["errors"].append(f"{label} serve HTTP {resp.status_code}")
-                print(f"    ✗ {label} serve returned {resp.status_code}")
-        except Exception as e:
-            result["errors"].append(f"{label} fetch error: {e}")
-            print(f"    ✗ {label} fetch error: {e}")
+                result["errors"].append(f"{label} serve returned an empty body")
+                log(f"    ✗ {label} serve returned an empty body")
+    finally:
+        for task in tasks:
+            task.cancel()
     return result
 
 
@@ -430,22 +564,108 @@ def _fetch_caption_urls(serve_urls: list[str], result: dict, label: str = "API")
 # Debug mode
 # ---------------------------------------------------------------------------
 
-def _inspect_page_debug(new_page, debug_info: dict, captured_urls: list) -> None:
-    """Populate *debug_info* with a full diagnostic snapshot of *new_page*."""
-    debug_info["final_url"] = new_page.url
-    debug_info["page_title"] = new_page.title()
+# Keywords used to bucket captured network URLs in debug mode
+_NETWORK_KEY_RE = re.compile(r"vtt|srt|caption|transcript|kaltura", re.IGNORECASE)
+
+
+# Debug mode: transcript/caption-looking elements in one frame.
+_JS_FRAME_ELEMENTS = """() => {
+    const results = [];
+    const els = document.querySelectorAll(
+        'button, a, div[role="button"], [aria-label], [aria-controls], ' +
+        '[class*="transcript"], [class*="caption"], [id*="transcript"], [id*="caption"]'
+    );
+    const label = /transcript|caption|subtitle|\\bcc\\b/i;
+    const labelOf = """ + _JS_LABEL_OF + """;
+    els.forEach(el => {
+        const tag = el.tagName.toUpperCase();
+        if (tag === 'STYLE' || tag === 'SCRIPT' || tag === 'NOSCRIPT') return;
+        // Cheapest attributes first; layout is only queried for matches.
+        // Only elements classed as transcript/caption panels have
+        // their full text read.
+        const panel = label.test(el.id || '') || label.test(el.getAttribute('class') || '');
+        const text = panel ? (el.textContent || '') : labelOf(el);
+        if (!panel && !label.test(el.getAttribute('aria-label') || '') &&
+            !label.test(text)) return;
+        const rect = el.getBoundingClientRect();
+        results.push({
+            tag: el.tagName, id: el.id || null,
+            text: text.trim().substring(0, 100),
+            ariaLabel: el.getAttribute('aria-label'),
+            className: el.className,
+            visible: rect.width > 0 && rect.height > 0,
+        });
+    });
+    return results;
+}"""
+
+
+# Debug mode: text tracks, iframes, transcript/CC controls and player
+# config found in the page's inline scripts, in one evaluate.
+_JS_DEBUG_SNAPSHOT = """() => {
+    const tracks = [];
+    document.querySelectorAll('track[kind="subtitles"], track[kind="captions"]').forEach(t => {
+        tracks.push({ kind: t.kind, src: t.src, srclang: t.srclang, label: t.label });
+    });
+    const iframes = [];
+    document.querySelectorAll('iframe').forEach(f => {
+        iframes.push({ src: f.src, title: f.title });
+    });
+
+    const ui = { transcript_buttons: [], captions_buttons: [] };
+    const isTranscript = /transcript/i;
+    const isCaptions = /captions|subtitle|\\bcc\\b/i;
+    const labelOf = """ + _JS_LABEL_OF + """;
+    document.querySelectorAll('button, a, div[role="button"], [aria-label], [aria-controls]').forEach(el => {
+        const text = labelOf(el);
+        const aria = el.getAttribute('aria-label') || '';
+        const entry = () => ({ tag: el.tagName, text: text.trim().substring(0, 50),
+            ariaLabel: el.getAttribute('aria-label'), visible: el.offsetParent !== null });
+        if (isTranscript.test(text) || isTranscript.test(aria) ||
+            isTranscript.test(el.getAttribute('aria-controls') || ''))
+            ui.transcript_buttons.push(entry());
+        if (isCaptions.test(text) || isCaptions.test(aria))
+            ui.captions_buttons.push(entry());
+    });
+
+    // All inline scripts in one string (NUL-separated so no match spans
+    // two scripts); each pattern then scans it once
+    const scripts = Array.from(document.querySelectorAll('script'), s => s.textContent || '')
+        .join('\\n\\u0000\\n');
+    const player = { entryId: null, mediaId: null, captions: [], captionUrls: [] };
+    const em = scripts.match(/entryId["']?\\s*:\\s*["']?([a-z0-9_]+)/i);
+    if (em) player.entryId = em[1];
+    const mm = scripts.match(/mediaId["']?\\s*:\\s*["']?([a-z0-9_]+)/i);
+    if (mm) player.mediaId = mm[1];
+    const cm = scripts.match(/"captions"\\s*:\\s*\\[(.*?)\\]/);
+    if (cm) player.captions = [cm[1]];
+    // Any URL naming a caption file or caption endpoint, deduplicated
+    player.captionUrls = [...new Set(
+        scripts.match(/https?:[^"'\\s]*?(?:\\.vtt|\\.srt|caption|transcript|subtitle)[^"'\\s]*/gi)
+    )];
+
+    return { tracks, iframes, ui, player };
+}"""
+
+
+async def _inspect_page_debug(page, debug_info: dict, captured_urls: list) -> None:
+    """Populate *debug_info* with a full diagnostic snapshot of *page*."""
+    debug_info["final_url"] = page.url
+    debug_info["page_title"] = await page.title()
     print(f"    Final URL:   {debug_info['final_url']}")
     print(f"    Page title:  {debug_info['page_title']}")
 
     try:
-        new_page.wait_for_load_state("networkidle", timeout=8000)
+        await page.wait_for_load_state("networkidle", timeout=8000)
         print(f"    Network idle reached")
     except Exception:
         print(f"    Network idle timeout — continuing")
 
-    # Frames
-    print(f"    Frames ({len(new_page.frames)} total)...")
-    for frame in new_page.frames:
+    # Frames — inspected concurrently, reported in frame order
+    frames = page.frames
+    print(f"    Frames ({len(frames)} total)...")
+
+    async def _inspect_frame(frame) -> dict:
         frame_info: dict = {
             "url": frame.url,
             "name": frame.name,
@@ -453,125 +673,55 @@ def _inspect_page_debug(new_page, debug_info: dict, captured_urls: list) -> None
             "transcript_caption_elements": [],
         }
         try:
-            frame_info["title"] = frame.title()
+            frame_info["title"] = await frame.title()
         except Exception:
             pass
 
         try:
-            elements = frame.evaluate("""() => {
-                const results = [];
-                const els = document.querySelectorAll(
-                    'button, a, div[role="button"], [aria-label], [aria-controls], ' +
-                    '[class*="transcript"], [class*="caption"], [id*="transcript"], [id*="caption"]'
-                );
-                els.forEach(el => {
-                    const tag = el.tagName.toUpperCase();
-                    if (tag === 'STYLE' || tag === 'SCRIPT' || tag === 'NOSCRIPT') return;
-                    const text = (el.textContent || '').toLowerCase();
-                    const aria = (el.getAttribute('aria-label') || '').toLowerCase();
-                    const cls  = (el.className || '').toLowerCase();
-                    const id   = (el.id || '').toLowerCase();
-                    if (text.includes('transcript') || text.includes('captions') ||
-                        text.includes('subtitle') ||
-                        aria.includes('transcript') || aria.includes('caption') || aria.includes('cc') ||
-                        cls.includes('transcript')  || cls.includes('caption') ||
-                        id.includes('transcript')   || id.includes('caption')) {
-                        const rect = el.getBoundingClientRect();
-                        results.push({
-                            tag: el.tagName, id: el.id || null,
-                            text: el.textContent?.trim().substring(0, 100),
-                            ariaLabel: el.getAttribute('aria-label'),
-                            className: el.className,
-                            visible: rect.width > 0 && rect.height > 0,
-                        });
-                    }
-                });
-                return results;
-            }""")
-            frame_info["transcript_caption_elements"] = elements
-            if elements:
-                print(f"      {frame.url[:70]}: {len(elements)} element(s)")
-                for el in elements[:3]:
-                    print(f"        [{el['tag']}] '{el['text'][:60]}' visible={el['visible']}")
+            frame_info["transcript_caption_elements"] = await frame.evaluate(_JS_FRAME_ELEMENTS)
         except Exception as fe:
             frame_info["transcript_caption_elements_error"] = str(fe)
-
+        return frame_info
+
+    for frame_info in await asyncio.gather(*(_inspect_frame(f) for f in frames)):
+        elements = frame_info["transcript_caption_elements"]
+        if elements:
+            print(f"      {frame_info['url'][:70]}: {len(elements)} element(s)")
+            for el in elements[:3]:
+                print(f"        [{el['tag']}] '{el['text'][:60]}' visible={el['visible']}")
         debug_info["frames"].append(frame_info)
-        print(f"      Frame: {frame.url[:80]}")
+        print(f"      Frame: {frame_info['url'][:80]}")
 
     # Network
-    print(f"    Network ({len(captured_urls)} responses)...")
+    print(f"    Network ({len(captured_urls)} relevant responses)...")
     for req in captured_urls:
-        url_lower = req["url"].lower()
-        for key in ("vtt", "srt", "caption", "transcript", "kaltura"):
-            if f".{key}" in url_lower or key in url_lower:
-                debug_info["network_urls"].setdefault(key, []).append(req)
+        # One scan per URL; a URL can land in several buckets (e.g. a Kaltura
+        # caption URL is both "kaltura" and "caption")
+        keys = dict.fromkeys(m.group().lower() for m in _NETWORK_KEY_RE.finditer(req["url"]))
+        for key in keys:
+            debug_info["network_urls"].setdefault(key, []).append(req)
     for key, urls in debug_info["network_urls"].items():
         if urls:
             print(f"      {key}: {len(urls)}")
             for r in urls[:2]:
                 print(f"        {r['url'][:90]} [{r['status']}]")
 
-    # Text tracks / iframes
-    dom = new_page.evaluate("""() => {
-        const tracks = [];
-        document.querySelectorAll('track[kind="subtitles"], track[kind="captions"]').forEach(t => {
-            tracks.push({ kind: t.kind, src: t.src, srclang: t.srclang, label: t.label });
-        });
-        const iframes = [];
-        document.querySelectorAll('iframe').forEach(f => {
-            iframes.push({ src: f.src, title: f.title });
-        });
-        return { tracks, iframes };
-    }""")
-    debug_info["text_tracks"] = dom.get("tracks", [])
-    debug_info["iframes"] = dom.get("iframes", [])
+    # Text tracks, iframes, caption/transcript buttons and player config in
+    # one round trip
+    snapshot = await page.evaluate(_JS_DEBUG_SNAPSHOT)
+
+    debug_info["text_tracks"] = snapshot.get("tracks", [])
+    debug_info["iframes"] = snapshot.get("iframes", [])
     print(f"    Text tracks: {len(debug_info['text_tracks'])}")
     print(f"    IFrames:     {len(debug_info['iframes'])}")
 
-    # Transcript / caption buttons in main page
-    ui = new_page.evaluate("""() => {
-        const res = { transcript_buttons: [], captions_buttons: [] };
-        document.querySelectorAll('button, a, div[role="button"], [aria-label], [aria-controls]').forEach(el => {
-            const text = (el.textContent || '').toLowerCase();
-            const aria = (el.getAttribute('aria-label') || '').toLowerCase();
-            const ctrl = (el.getAttribute('aria-controls') || '').toLowerCase();
-            if (text.includes('transcript') || aria.includes('transcript') || ctrl.includes('transcript'))
-                res.transcript_buttons.push({ tag: el.tagName,
-                    text: el.textContent?.trim().substring(0, 50),
-                    ariaLabel: el.getAttribute('aria-label'), visible: el.offsetParent !== null });
-            if (text.includes('cc') || text.includes('captions') || text.includes('subtitle') ||
-                aria.includes('cc') || aria.includes('captions'))
-                res.captions_buttons.push({ tag: el.tagName,
-                    text: el.textContent?.trim().substring(0, 50),
-                    ariaLabel: el.getAttribute('aria-label'), visible: el.offsetParent !== null });
-        });
-        return res;
-    }""")
+    ui = snapshot.get("ui", {})
     debug_info["transcript_buttons"] = ui.get("transcript_buttons", [])
     debug_info["captions_buttons"] = ui.get("captions_buttons", [])
     print(f"    Transcript buttons: {len(debug_info['transcript_buttons'])}")
     print(f"    Caption/CC buttons: {len(debug_info['captions_buttons'])}")
 
-    # Player config
-    player = new_page.evaluate("""() => {
-        const data = { entryId: null, mediaId: null, captions: [], captionUrls: [] };
-        for (const s of document.querySelectorAll('script')) {
-            const c = s.textContent || '';
-            const em = c.match(/entryId["']?\\s*:\\s*["']?([a-z0-9_]+)/i);
-            if (em) data.entryId = em[1];
-            const mm = c.match(/mediaId["']?\\s*:\\s*["']?([a-z0-9_]+)/i);
-            if (mm) data.mediaId = mm[1];
-            const cm = c.match(/"captions"\\s*:\\s*\\[(.*?)\\]/);
-            if (cm) data.captions = [cm[1]];
-            data.captionUrls.push(
-                ...(c.match(/https?:[^"'\\s]+\\.(?:vtt|srt)[^"'\\s]*/gi) || []),
-                ...(c.match(/https?:[^"'\\s]*(?:caption|transcript|subtitle)[^"'\\s]*/gi) || [])
-            );
-        }
-        data.captionUrls = [...new Set(data.captionUrls)];
-        return data;
-    }""")
+    player = snapshot.get("player", {})
     debug_info["player_config"] = player
     print(f"    Entry ID: {player.get('entryId')}  Media ID: {player.get('mediaId')}")
     cap_urls = player.get("captionUrls", [])
@@ -600,7 +750,7 @@ def _inspect_page_debug(new_page, debug_info: dict, captured_urls: list) -> None
         )
 
 
-def debug_kaltura_video(page, link_data: dict, session_context, browser) -> dict:
+async def debug_kaltura_video(page, link_data: dict) -> dict:
     """Deep-inspect one Kaltura video page and return a diagnostic dict.
 
     Saves a ``kaltura_debug.json`` snapshot that helps diagnose why a video's
@@ -630,24 +780,29 @@ def debug_kaltura_video(page, link_data: dict, session_context, browser) -> dict
     }
 
     try:
-        new_page = session_context.new_page()
         captured_urls: list[dict] = []
 
         def _capture(response) -> None:
+            # Only URLs that land in a report bucket are kept
+            if not _NETWORK_KEY_RE.search(response.url):
+                return
             captured_urls.append({
                 "url": response.url,
                 "status": response.status,
                 "content_type": response.headers.get("content-type", ""),
             })
 
-        new_page.on("response", _capture)
-        new_page.goto(href)
-        new_page.wait_for_load_state("domcontentloaded", timeout=30000)
+        page.on("response", _capture)
+        await page.goto(href, wait_until="domcontentloaded", timeout=30000)
         print(f"    DOM loaded — waiting for player to initialise...")
-        time.sleep(5)
+        # The player asking for its caption URL means it has initialised;
+        # players without captions get the full 5 s
+        try:
+            await page.wait_for_event("response", predicate=_is_caption_url_request, timeout=5000)
+        except Exception:
+            pass
 
-        _inspect_page_debug(new_page, debug_info, captured_urls)
-        new_page.close()
+        await _inspect_page_debug(page, debug_info, captured_urls)
 
     except Exception as e:
         debug_info["error"] = str(e)